@@ -85,13 +85,15 @@ class LoRaModule(BaseModule):
                 reset_pin = config.get('reset_pin', 18)
                 busy_pin = config.get('busy_pin', 24)
                 dio1_pin = config.get('dio1_pin', 23)
+                spi_hz = config.get('spi_hz', SX1262.DEFAULT_SPI_HZ)
                 
                 self.sx1262 = SX1262(
                     spi_bus=spi_bus,
                     spi_device=spi_device,
                     reset_pin=reset_pin,
                     busy_pin=busy_pin,
-                    dio1_pin=dio1_pin
+                    dio1_pin=dio1_pin,
+                    spi_hz=spi_hz
                 )
                 
                 if self.sx1262.initialize():
@@ -5,7 +5,7 @@ Supports Orange Pi GPIO with SPI interface
 
 import time
 import logging
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 try:
     import spidev
@@ -42,12 +42,22 @@ class SX1262:
     CMD_SET_PACKET_PARAMS = 0x8C
     CMD_WRITE_BUFFER = 0x0E
     CMD_READ_BUFFER = 0x1E
+    CMD_GET_RX_BUFFER_STATUS = 0x13
+    CMD_SET_PACKET_TYPE = 0x8A
     CMD_GET_STATUS = 0xC0
     CMD_GET_RSSI = 0x15
     CMD_GET_PACKET_STATUS = 0x14
     
+    # SPI clock. The chip accepts up to 16 MHz; Waveshare HAT traces are
+    # short enough for 8-10 MHz. Fall back to the old 2 MHz if rejected.
+    DEFAULT_SPI_HZ = 8000000
+    FALLBACK_SPI_HZ = 2000000
+    
+    MAX_PAYLOAD = 255
+    
     def __init__(self, spi_bus: int = 0, spi_device: int = 0,
-                 reset_pin: int = 18, busy_pin: int = 24, dio1_pin: int = 23):
+                 reset_pin: int = 18, busy_pin: int = 24, dio1_pin: int = 23,
+                 spi_hz: int = DEFAULT_SPI_HZ):
         """
         Initialize SX1262 driver.
         
@@ -57,6 +67,7 @@ class SX1262:
             reset_pin: Reset GPIO pin
             busy_pin: BUSY GPIO pin
             dio1_pin: DIO1 GPIO pin
+            spi_hz: SPI clock speed in Hz
         """
         self.logger = logging.getLogger("cyberdeck.sx1262")
         
@@ -65,10 +76,19 @@ class SX1262:
         self.reset_pin = reset_pin
         self.busy_pin = busy_pin
         self.dio1_pin = dio1_pin
+        self.spi_hz = spi_hz
         
         self.spi = None
         self.enabled = False
         
+        # Scratch buffer for command frames: opcode + up to 15 parameter bytes
+        self._cmd_buf = bytearray(16)
+        
+        # Pre-allocated WriteBuffer frame: opcode, offset, payload
+        self._tx_buf = bytearray(2 + self.MAX_PAYLOAD)
+        self._tx_buf[0] = self.CMD_WRITE_BUFFER
+        self._tx_buf[1] = 0x00
+        
         # LoRa parameters
         self.frequency = 868000000  # 868 MHz
         self.bandwidth = 125000  # 125 kHz
@@ -97,19 +117,27 @@ class SX1262:
             # Initialize SPI
             self.spi = spidev.SpiDev()
             self.spi.open(self.spi_bus, self.spi_device)
-            self.spi.max_speed_hz = 2000000  # 2 MHz
+            try:
+                self.spi.max_speed_hz = self.spi_hz
+            except IOError:
+                self.logger.warning(f"SPI clock {self.spi_hz}Hz rejected, "
+                                    f"falling back to {self.FALLBACK_SPI_HZ}Hz")
+                self.spi_hz = self.FALLBACK_SPI_HZ
+                self.spi.max_speed_hz = self.spi_hz
             self.spi.mode = 0
             
-            # Reset chip
+            # Reset chip; it accepts commands as soon as BUSY drops
             self.reset()
-            time.sleep(0.1)
+            self.wait_busy()
             
-            # Configure for LoRa
-            self.set_standby()
-            self.set_packet_type_lora()
-            self.set_rf_frequency(self.frequency)
-            self.set_tx_params(self.tx_power, 0x04)
-            self.configure_modulation()
+            # Configure for LoRa in one batch
+            self.send_commands([
+                (self.CMD_SET_STANDBY, b'\x00'),
+                (self.CMD_SET_PACKET_TYPE, b'\x01'),  # Packet type: LoRa
+                (self.CMD_SET_RF_FREQUENCY, self._rf_frequency_params(self.frequency)),
+                (self.CMD_SET_TX_PARAMS, bytes((self.tx_power & 0xFF, 0x04))),
+                (self.CMD_SET_MODULATION_PARAMS, self._modulation_params()),
+            ])
             
             self.enabled = True
             self.logger.info(f"SX1262 initialized on SPI {self.spi_bus}.{self.spi_device}")
@@ -128,54 +156,85 @@ class SX1262:
     
     def wait_busy(self, timeout: float = 1.0):
         """Wait for BUSY pin to go low"""
-        start = time.time()
+        start = time.monotonic_ns()
+        timeout_ns = int(timeout * 1e9)
         while GPIO.input(self.busy_pin) == GPIO.HIGH:
-            if (time.time() - start) > timeout:
+            if (time.monotonic_ns() - start) > timeout_ns:
                 raise TimeoutError("SX1262 BUSY timeout")
             time.sleep(0.001)
     
-    def send_command(self, cmd: int, data: List[int] = None):
+    def wait_dio1(self, timeout: float) -> bool:
+        """
+        Wait for DIO1 to go high (RX done).
+        
+        Args:
+            timeout: Timeout in seconds
+            
+        Returns:
+            bool: True if DIO1 is high, False on timeout
+        """
+        if GPIO.input(self.dio1_pin) == GPIO.HIGH:
+            return True
+        
+        channel = GPIO.wait_for_edge(self.dio1_pin, GPIO.RISING,
+                                     timeout=max(1, int(timeout * 1000)))
+        if channel is not None:
+            return True
+        
+        # DIO1 latches until the IRQ is cleared - an edge that landed between
+        # the first check and arming wait_for_edge still shows up as a level
+        return GPIO.input(self.dio1_pin) == GPIO.HIGH
+    
+    def send_command(self, cmd: int, data: bytes = b''):
         """Send command to SX1262"""
         self.wait_busy()
         
-        if data is None:
-            data = []
-            
-        packet = [cmd] + data
-        self.spi.xfer2(packet)
+        n = len(data)
+        self._cmd_buf[0] = cmd
+        self._cmd_buf[1:1 + n] = data
+        self.spi.xfer2(memoryview(self._cmd_buf)[:1 + n])
         
         # Some commands need extra wait
-        if cmd in [self.CMD_SET_TX, self.CMD_SET_RX]:
+        if cmd in (self.CMD_SET_TX, self.CMD_SET_RX):
             time.sleep(0.001)
     
+    def send_commands(self, commands: List[Tuple[int, bytes]]):
+        """
+        Send a sequence of commands back-to-back.
+        
+        Args:
+            commands: List of (opcode, parameter bytes)
+        """
+        for cmd, data in commands:
+            self.send_command(cmd, data)
+    
     def set_standby(self):
         """Set to standby mode"""
-        self.send_command(self.CMD_SET_STANDBY, [0x00])
+        self.send_command(self.CMD_SET_STANDBY, b'\x00')
     
     def set_packet_type_lora(self):
         """Set packet type to LoRa"""
-        self.send_command(0x8A, [0x01])  # Packet type: LoRa
+        self.send_command(self.CMD_SET_PACKET_TYPE, b'\x01')  # Packet type: LoRa
+    
+    @staticmethod
+    def _rf_frequency_params(freq: int) -> bytes:
+        """SetRfFrequency parameters for frequency in Hz"""
+        freq_reg = int((freq * (2**25)) / 32000000)
+        return freq_reg.to_bytes(4, 'big')
     
     def set_rf_frequency(self, freq: int):
         """Set RF frequency in Hz"""
-        freq_reg = int((freq * (2**25)) / 32000000)
-        
-        self.send_command(self.CMD_SET_RF_FREQUENCY, [
-            (freq_reg >> 24) & 0xFF,
-            (freq_reg >> 16) & 0xFF,
-            (freq_reg >> 8) & 0xFF,
-            freq_reg & 0xFF
-        ])
+        self.send_command(self.CMD_SET_RF_FREQUENCY, self._rf_frequency_params(freq))
         
         self.frequency = freq
         self.logger.debug(f"Frequency set to {freq / 1e6}MHz")
     
     def set_tx_params(self, power: int, ramp_time: int):
         """Set TX parameters"""
-        self.send_command(self.CMD_SET_TX_PARAMS, [power, ramp_time])
+        self.send_command(self.CMD_SET_TX_PARAMS, bytes((power & 0xFF, ramp_time)))
     
-    def configure_modulation(self):
-        """Configure LoRa modulation parameters"""
+    def _modulation_params(self) -> bytes:
+        """SetModulationParams parameters for current LoRa settings"""
         # Spreading Factor: 7-12
         # Bandwidth: 0x04 = 125kHz
         # Coding Rate: 1-4 (4/5 to 4/8)
@@ -186,31 +245,38 @@ class SX1262:
         cr_val = self.coding_rate - 4  # Convert to register value
         ldro = 0x00
         
-        self.send_command(self.CMD_SET_MODULATION_PARAMS, [
-            sf_val, bw_val, cr_val, ldro
-        ])
+        return bytes((sf_val, bw_val, cr_val, ldro))
+    
+    def configure_modulation(self):
+        """Configure LoRa modulation parameters"""
+        self.send_command(self.CMD_SET_MODULATION_PARAMS, self._modulation_params())
     
     def transmit(self, data: bytes):
         """Transmit data"""
         if not self.enabled:
             return
             
+        n = len(data)
+        if n > self.MAX_PAYLOAD:
+            self.logger.error(f"Payload too long: {n} > {self.MAX_PAYLOAD} bytes")
+            return
+            
         try:
             # Write to buffer
             self.wait_busy()
-            packet = [self.CMD_WRITE_BUFFER, 0x00] + list(data)
-            self.spi.xfer2(packet)
+            self._tx_buf[2:2 + n] = data
+            self.spi.xfer2(memoryview(self._tx_buf)[:2 + n])
             
             # Set packet params
-            self.send_command(self.CMD_SET_PACKET_PARAMS, [
+            self.send_command(self.CMD_SET_PACKET_PARAMS, bytes((
                 0x00, 0x00,  # Preamble length
                 0x00,  # Header type
-                len(data),  # Payload length
+                n,  # Payload length
                 0x01, 0x00, 0x00  # CRC, invert IQ, etc
-            ])
+            )))
             
             # Transmit
-            self.send_command(self.CMD_SET_TX, [0x00, 0x00, 0x00])
+            self.send_command(self.CMD_SET_TX, b'\x00\x00\x00')
             
             # Wait for TX done
             time.sleep(0.5)
@@ -227,41 +293,52 @@ class SX1262:
             
         try:
             # Enter RX mode
-            self.send_command(self.CMD_SET_RX, [0xFF, 0xFF, 0xFF])
+            self.send_command(self.CMD_SET_RX, b'\xFF\xFF\xFF')
             
-            # Wait for packet
-            start = time.time()
-            while (time.time() - start) < timeout:
-                # Check DIO1 for RX done
-                if GPIO.input(self.dio1_pin) == GPIO.HIGH:
-                    # Read buffer
-                    self.wait_busy()
-                    read_cmd = [self.CMD_READ_BUFFER, 0x00, 0x00] + [0x00] * 255
-                    result = self.spi.xfer2(read_cmd)
-                    
-                    # Parse received data (skip first 3 bytes)
-                    rx_data = bytes(result[3:])
-                    
-                    # Back to standby
-                    self.set_standby()
-                    
-                    return rx_data
-                    
-                time.sleep(0.01)
+            # Wait for RX done on DIO1 (blocks in the kernel, no polling)
+            if not self.wait_dio1(timeout):
+                # Timeout - back to standby
+                self.set_standby()
+                return None
             
-            # Timeout - back to standby
+            # Query payload length and start offset
+            payload_len, rx_start_ptr = self.get_rx_buffer_status()
+            
+            # Read only the received payload
+            self.wait_busy()
+            read_cmd = bytearray(3 + payload_len)
+            read_cmd[0] = self.CMD_READ_BUFFER
+            read_cmd[1] = rx_start_ptr
+            result = self.spi.xfer2(read_cmd)
+            
+            # Parse received data (skip opcode, offset and status bytes)
+            rx_data = bytes(result[3:])
+            
+            # Back to standby
             self.set_standby()
-            return None
+            
+            return rx_data
             
         except Exception as e:
             self.logger.error(f"Receive error: {e}")
             self.set_standby()
             return None
     
+    def get_rx_buffer_status(self) -> Tuple[int, int]:
+        """
+        Get length and buffer offset of the last received payload.
+        
+        Returns:
+            Tuple[int, int]: (payload length, RX start buffer pointer)
+        """
+        self.wait_busy()
+        result = self.spi.xfer2(bytes((self.CMD_GET_RX_BUFFER_STATUS, 0x00, 0x00, 0x00)))
+        return result[2], result[3]
+    
     def get_rssi(self) -> int:
         """Get RSSI value"""
         self.wait_busy()
-        result = self.spi.xfer2([self.CMD_GET_RSSI, 0x00, 0x00])
+        result = self.spi.xfer2(bytes((self.CMD_GET_RSSI, 0x00, 0x00)))
         rssi_raw = result[2]
         rssi_dbm = -rssi_raw // 2
         return rssi_dbm
@@ -7,8 +7,82 @@ from core.base_module import BaseModule
 from typing import List, Tuple, Callable, Optional
 import os
 import json
+import base64
+import queue
+import threading
+from collections import Counter
 from datetime import datetime
 
+import numpy as np
+
+from .pn532_driver import DEFAULT_KEYS, DEFAULT_KEYS_MV
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _json_dumps(obj) -> bytes:
+    """Serialize to compact JSON (orjson if available)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+
+def _json_loads(data: bytes):
+    """Parse JSON (orjson if available)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _format_uid(uid) -> str:
+    """Format UID bytes as AA:BB:CC:DD"""
+    return ':'.join(f"{b:02X}" for b in uid)
+
+
+# Flush the key cache to disk this many seconds after the last change
+KEYCACHE_FLUSH_DELAY = 5.0
+
+# Dump block storage: up to 40 sectors (Mifare 4K) of 4 x 16-byte blocks
+DUMP_MAX_SECTORS = 40
+DUMP_SECTOR_SIZE = 64
+
+# Default Mifare keys as 6-byte views into the driver's key table
+_DEFAULT_KEYS = tuple(
+    DEFAULT_KEYS_MV[i:i + 6] for i in range(0, len(DEFAULT_KEYS), 6)
+)
+
+# Static UI texts
+_NO_CARD_TEXT = "No card detected.\n\nPlease scan a card first."
+
+_WRITE_DATA_TEXT = (
+    "Write data to card\n\n"
+    "Feature coming soon:\n"
+    "- Write specific blocks\n"
+    "- Write from dump file\n"
+    "- Write custom data"
+)
+
+_CLONE_HELP_TEXT = (
+    "Clone Card\n\n"
+    "This feature allows you to clone\n"
+    "a Mifare Classic card to another.\n\n"
+    "Steps:\n"
+    "1. Read source card\n"
+    "2. Place target card\n"
+    "3. Write data\n\n"
+    "Coming soon..."
+)
+
+_DICT_ATTACK_FOOTER = (
+    "This will try common keys for\n"
+    "all sectors.\n\n"
+    "Starting attack..."
+)
+
 
 class NFCModule(BaseModule):
     """
@@ -31,23 +105,40 @@ class NFCModule(BaseModule):
 
         self.pn532 = None
         self.dumps_dir = "nfc_dumps"
-        self.dumps = []
+        self.dumps = None  # Dump metadata, parsed lazily, see _ensure_dumps_loaded()
+        # Sector data of all dumps, row i belongs to self.dumps[i]
+        self.dump_blocks = np.zeros((0, DUMP_MAX_SECTORS, DUMP_SECTOR_SIZE), dtype=np.uint8)
+        self.dump_sectors = np.zeros((0, DUMP_MAX_SECTORS), dtype=bool)  # sectors present
+        self.dump_count = 0
+        self._dump_files = []
+        self._dump_keys = set()  # (uid, timestamp) of dumps in self.dumps
         self.last_card = None
         self.default_keys = self._load_default_keys()
+        self.user_keys = b''  # Extra 6-byte keys from nfc.key_dictionary
+        # uid_hex -> {sector: (key_type, key bytes)} of keys that worked
+        self._key_cache = {}
+        self._key_cache_file = os.path.join(self.dumps_dir, ".keycache.json")
+        self._key_cache_dirty = False
+        self._key_cache_timer = None
+        # Guards _key_cache and _key_cache_dirty against the flush timer thread
+        self._key_cache_lock = threading.Lock()
+        # Held around every PN532 exchange; the sector probe worker keeps it
+        # for the whole probe, since the card's auth state spans sectors
+        self._pn532_lock = threading.Lock()
+
+        # Dump Manager menu: label -> action (None = back)
+        self._dump_menu_actions = {
+            "View all dumps": self._view_dumps,
+            "Delete dump": self._delete_dump,
+            "Export dump": self._export_dump,
+            "Back": None,
+        }
 
         os.makedirs(self.dumps_dir, exist_ok=True)
 
-    def _load_default_keys(self) -> List[List[int]]:
-        """Load default Mifare keys"""
-        return [
-            [0xFF, 0xFF, 0xFF, 0xFF, 0xFF, 0xFF],  # Factory default
-            [0xA0, 0xA1, 0xA2, 0xA3, 0xA4, 0xA5],  # MAD key
-            [0xD3, 0xF7, 0xD3, 0xF7, 0xD3, 0xF7],  # NDEF key
-            [0x00, 0x00, 0x00, 0x00, 0x00, 0x00],  # All zeros
-            [0xB0, 0xB1, 0xB2, 0xB3, 0xB4, 0xB5],  # Common key
-            [0x4D, 0x3A, 0x99, 0xC3, 0x51, 0xDD],  # Common key 2
-            [0x1A, 0x98, 0x2C, 0x7E, 0x45, 0x9A],  # Common key 3
-        ]
+    def _load_default_keys(self) -> Tuple[memoryview, ...]:
+        """Load default Mifare keys (shared module-level table)"""
+        return _DEFAULT_KEYS
 
     def on_load(self):
         """Инициализация модуля"""
@@ -67,6 +158,7 @@ class NFCModule(BaseModule):
         spi_device = nfc_config.get('spi_device', 2)
         cs_pin = nfc_config.get('cs_pin', 23)
         reset_pin = nfc_config.get('reset_pin', None)
+        irq_pin = nfc_config.get('irq_pin', None)
         i2c_bus = nfc_config.get('i2c_bus', 0)
         i2c_address = nfc_config.get('i2c_address', 0x24)
 
@@ -80,14 +172,16 @@ class NFCModule(BaseModule):
                     spi_bus=spi_bus,
                     spi_device=spi_device,
                     cs_pin=cs_pin,
-                    reset_pin=reset_pin
+                    reset_pin=reset_pin,
+                    irq_pin=irq_pin
                 )
             elif 'i2c' in interface:
                 self.pn532 = PN532(
                     interface='i2c',
                     i2c_bus=i2c_bus,
                     i2c_address=i2c_address,
-                    reset_pin=reset_pin
+                    reset_pin=reset_pin,
+                    irq_pin=irq_pin
                 )
             else:
                 self.log_error(f"Unsupported interface: {interface}")
@@ -106,13 +200,19 @@ class NFCModule(BaseModule):
             self.log_error(f"Failed to initialize PN532: {e}")
             self.enabled = False
 
-        # Load saved dumps
+        # Load saved dumps, known card keys and user key dictionary
         self._load_dumps()
+        self._key_cache = self._load_keycache()
+        self.user_keys = self._load_key_dictionary(nfc_config.get('key_dictionary'))
 
     def on_unload(self):
         """Освобождение ресурсов"""
+        if self._key_cache_timer is not None:
+            self._key_cache_timer.cancel()
+        self._save_keycache()
         if self.pn532:
-            self.pn532.close()
+            with self._pn532_lock:
+                self.pn532.close()
         self.log_info("NFC module unloaded")
 
     def get_menu_items(self) -> List[Tuple[str, Callable]]:
@@ -138,8 +238,7 @@ class NFCModule(BaseModule):
             return "NFC: Disabled"
 
         if self.last_card:
-            uid = ':'.join([f"{b:02X}" for b in self.last_card['uid']])
-            return f"NFC: {uid}"
+            return f"NFC: {self.last_card['uid_str']}"
 
         return "NFC: Ready"
 
@@ -156,16 +255,18 @@ class NFCModule(BaseModule):
         )
 
         # Wait for card
-        card_info = self.pn532.read_passive_target(card_type=0x00, timeout=5.0)
+        with self._pn532_lock:
+            card_info = self.pn532.read_passive_target(card_type=0x00, timeout=5.0)
 
         if not card_info:
             self.show_message("Scan", "No card detected.\n\nPlease try again.")
             return
 
-        self.last_card = card_info
+        # Format UID once per detection
+        uid_str = card_info['uid_str'] = _format_uid(card_info['uid'])
+        card_info['uid_hex'] = bytes(card_info['uid']).hex()
 
-        # Format UID
-        uid_str = ':'.join([f"{b:02X}" for b in card_info['uid']])
+        self.last_card = card_info
 
         # Display card info
         info_text = f"Card Detected!\n\n"
@@ -212,41 +313,32 @@ class NFCModule(BaseModule):
         dump_data = {}
         successful_sectors = 0
 
-        for sector in range(num_sectors):
-            # Try to authenticate with default keys
-            authenticated = False
+        uid = self.last_card['uid']
+        keys = self._candidate_keys(self.last_card['uid_hex'])
+        with self._key_cache_lock:
+            card_keys = self._key_cache.setdefault(self.last_card['uid_hex'], {})
 
-            for key_type in [0x60, 0x61]:  # Key A and Key B
-                for key in self.default_keys:
-                    block = sector * 4
+        # PN532 I/O runs on a worker thread; results are handled here
+        for sector, found_key, sector_data in self._probe_sectors(uid, num_sectors, card_keys, keys):
+            self.show_progress(sector + 1, num_sectors, f"Sector {sector}")
 
-                    if self.pn532.mifare_classic_authenticate(
-                        self.last_card['uid'], block, key_type, key
-                    ):
-                        authenticated = True
-                        break
-
-                if authenticated:
-                    break
-
-            if not authenticated:
+            if found_key is None:
                 self.log_warning(f"Failed to authenticate sector {sector}")
                 continue
 
-            # Read all blocks in sector
-            sector_data = []
-            for block_offset in range(4):
-                block = sector * 4 + block_offset
-                data = self.pn532.mifare_classic_read_block(block)
-
-                if data:
-                    sector_data.append(data)
-                else:
-                    self.log_warning(f"Failed to read block {block}")
+            if card_keys.get(sector) != found_key:
+                with self._key_cache_lock:
+                    card_keys[sector] = found_key
+                    self._key_cache_dirty = True
 
-            if len(sector_data) == 4:
+            if sector_data:
                 dump_data[sector] = sector_data
                 successful_sectors += 1
+            else:
+                self.log_warning(f"Failed to read sector {sector}")
+
+        if self._key_cache_dirty:
+            self._schedule_keycache_flush()
 
         # Display results
         result_text = f"Read Complete\n\n"
@@ -266,30 +358,137 @@ class NFCModule(BaseModule):
 
         self.show_message("Results", result_text)
 
+    def _probe_sectors(self, uid: List[int], num_sectors: int, card_keys: dict, keys: bytes):
+        """
+        Authenticate and read sectors on a PN532 worker thread.
+
+        Sector jobs are queued up front; the worker tries the cached key for
+        the sector, then the last key that worked, then the rest. Results are
+        yielded in sector order as they arrive so the caller's bookkeeping
+        overlaps with the next sector's SPI traffic.
+
+        Yields:
+            (sector, (key_type, key bytes) or None, sector bytes or None)
+        """
+        jobs = queue.SimpleQueue()
+        results = queue.SimpleQueue()
+
+        def worker():
+            last_key = None
+            with self._pn532_lock:
+                while True:
+                    job = jobs.get()
+                    if job is None:
+                        break
+
+                    sector, cached_key = job
+                    found_key = sector_data = None
+                    try:
+                        found_key = self._authenticate_sector(uid, sector, keys,
+                                                              cached_key or last_key)
+                        if found_key:
+                            sector_data = self.pn532.mifare_classic_read_sector(sector * 4)
+                    except Exception as e:
+                        self.log_error(f"Sector {sector} probe failed: {e}")
+
+                    if found_key:
+                        last_key = found_key
+                    results.put((sector, found_key, sector_data))
+
+        thread = threading.Thread(target=worker, daemon=True)
+        thread.start()
+
+        for sector in range(num_sectors):
+            jobs.put((sector, card_keys.get(sector)))
+        jobs.put(None)
+
+        for _ in range(num_sectors):
+            yield results.get()
+
+        thread.join()
+
+    def _authenticate_sector(self, uid: List[int], sector: int, keys: bytes,
+                             preferred: Optional[Tuple[int, bytes]] = None) -> Optional[Tuple[int, bytes]]:
+        """
+        Authenticate sector with a key list.
+
+        Args:
+            uid: Card UID
+            sector: Sector number
+            keys: Concatenated 6-byte candidate keys
+            preferred: (key_type, key) to try before the rest
+
+        Returns:
+            (key_type, key) that authenticated, or None
+        """
+        block = sector * 4
+        key_types = (0x60, 0x61)  # Key A and Key B
+        if preferred and preferred[0] == 0x61:
+            key_types = (0x61, 0x60)
+
+        for key_type in key_types:
+            candidates = keys
+            if preferred and preferred[0] == key_type:
+                key = preferred[1]
+                candidates = key + b''.join(
+                    keys[i:i + 6] for i in range(0, len(keys), 6) if keys[i:i + 6] != key
+                )
+
+            index = self.pn532.mifare_classic_authenticate_batch(uid, block, candidates, key_type)
+            if index is not None:
+                return key_type, bytes(candidates[index * 6:index * 6 + 6])
+
+        return None
+
+    def _candidate_keys(self, uid_hex: str) -> bytes:
+        """
+        Build the key list for a card in priority order.
+
+        Keys already found on this card come first, then keys found on other
+        cards (most common first, cards of one system tend to share keys),
+        then the default and user dictionaries.
+
+        Returns:
+            Concatenated unique 6-byte keys
+        """
+        found_here = [key for _, key in self._key_cache.get(uid_hex, {}).values()]
+        found_anywhere = Counter(
+            key for sectors in self._key_cache.values() for _, key in sectors.values()
+        )
+        user_keys = [self.user_keys[i:i + 6] for i in range(0, len(self.user_keys), 6)]
+
+        ordered = dict.fromkeys(found_here)
+        ordered.update(dict.fromkeys(key for key, _ in found_anywhere.most_common()))
+        ordered.update(dict.fromkeys(bytes(key) for key in self.default_keys))
+        ordered.update(dict.fromkeys(user_keys))
+        return b''.join(ordered)
+
     def _save_dump(self, dump_data: dict):
         """Сохранение дампа карты"""
-        uid_str = ':'.join([f"{b:02X}" for b in self.last_card['uid']])
+        uid_str = self.last_card['uid_str']
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"dump_{uid_str.replace(':', '')}_{timestamp}.json"
         filepath = os.path.join(self.dumps_dir, filename)
 
         dump_info = {
-            'uid': [b for b in self.last_card['uid']],
+            'uid': list(self.last_card['uid']),
             'type': self.last_card['type'],
             'timestamp': timestamp,
-            'sectors': {}
         }
 
-        # Convert dump_data to JSON-serializable format
-        for sector, blocks in dump_data.items():
-            dump_info['sectors'][str(sector)] = [
-                [b for b in block] for block in blocks
-            ]
+        # Sector data is stored base64-encoded in the JSON file
+        with open(filepath, 'wb') as f:
+            f.write(_json_dumps(dict(dump_info, sectors={
+                str(sector): base64.b64encode(data).decode()
+                for sector, data in dump_data.items()
+            })))
 
-        with open(filepath, 'w') as f:
-            json.dump(dump_info, f, indent=2)
+        dump_info['uid_str'] = uid_str
 
-        self.dumps.append(dump_info)
+        self._ensure_dumps_loaded()
+        self._add_dump(dump_info, dump_data)
+        if filepath not in self._dump_files:
+            self._dump_files.append(filepath)
 
         self.show_message(
             "Dump Saved",
@@ -302,46 +501,27 @@ class NFCModule(BaseModule):
     def write_data(self):
         """Запись данных на карту"""
         if not self.last_card:
-            self.show_error("No card detected.\n\nPlease scan a card first.")
+            self.show_error(_NO_CARD_TEXT)
             return
 
-        self.show_message(
-            "Write Data",
-            "Write data to card\n\n"
-            "Feature coming soon:\n"
-            "- Write specific blocks\n"
-            "- Write from dump file\n"
-            "- Write custom data"
-        )
+        self.show_message("Write Data", _WRITE_DATA_TEXT)
 
     def clone_card(self):
         """Клонирование карты"""
-        self.show_message(
-            "Clone Card",
-            "Clone Card\n\n"
-            "This feature allows you to clone\n"
-            "a Mifare Classic card to another.\n\n"
-            "Steps:\n"
-            "1. Read source card\n"
-            "2. Place target card\n"
-            "3. Write data\n\n"
-            "Coming soon..."
-        )
+        self.show_message("Clone Card", _CLONE_HELP_TEXT)
 
     def dictionary_attack(self):
         """Брутфорс ключей по словарю"""
         if not self.last_card:
-            self.show_error("No card detected.\n\nPlease scan a card first.")
+            self.show_error(_NO_CARD_TEXT)
             return
 
         self.show_message(
             "Dictionary Attack",
             "Dictionary Attack\n\n"
             f"Card: {self.last_card['type']}\n"
-            f"Keys to try: {len(self.default_keys)}\n\n"
-            "This will try common keys for\n"
-            "all sectors.\n\n"
-            "Starting attack..."
+            f"Keys to try: {len(self._candidate_keys(self.last_card['uid_hex'])) // 6}\n\n"
+            + _DICT_ATTACK_FOOTER
         )
 
         # This is handled by read_mifare_classic for now
@@ -351,7 +531,7 @@ class NFCModule(BaseModule):
 
     def dump_manager(self):
         """Управление дампами"""
-        if not self.dumps:
+        if not self._dump_files:
             self.show_message(
                 "Dump Manager",
                 "No dumps saved yet.\n\n"
@@ -359,44 +539,197 @@ class NFCModule(BaseModule):
             )
             return
 
-        dump_list = ["View all dumps", "Delete dump", "Export dump", "Back"]
+        labels = list(self._dump_menu_actions)
 
-        choice = self.show_menu("Dump Manager", dump_list)
+        choice = self.show_menu("Dump Manager", labels)
 
-        if choice == 0:
-            self._view_dumps()
-        elif choice == 1:
-            self._delete_dump()
-        elif choice == 2:
-            self._export_dump()
+        if 0 <= choice < len(labels):
+            action = self._dump_menu_actions[labels[choice]]
+            if action:
+                action()
 
     def _view_dumps(self):
         """Просмотр дампов"""
         dump_text = "Saved Dumps:\n\n"
 
-        for i, dump in enumerate(self.dumps, 1):
-            uid = ':'.join([f"{b:02X}" for b in dump['uid']])
-            dump_text += f"{i}. {uid}\n"
+        for i, dump in enumerate(self._ensure_dumps_loaded(), 1):
+            dump_text += f"{i}. {dump['uid_str']}\n"
             dump_text += f"   Type: {dump['type']}\n"
             dump_text += f"   Date: {dump['timestamp']}\n"
-            dump_text += f"   Sectors: {len(dump['sectors'])}\n\n"
+            dump_text += f"   Sectors: {int(self.dump_sectors[dump['row']].sum())}\n\n"
 
         self.show_message("Dumps", dump_text)
 
     def _load_dumps(self):
-        """Загрузка сохранённых дампов"""
+        """Индексация сохранённых дампов (парсинг откладывается)"""
         try:
-            for filename in os.listdir(self.dumps_dir):
-                if filename.endswith('.json'):
-                    filepath = os.path.join(self.dumps_dir, filename)
-                    with open(filepath, 'r') as f:
-                        dump = json.load(f)
-                        self.dumps.append(dump)
+            self._dump_files = [
+                os.path.join(self.dumps_dir, filename)
+                for filename in os.listdir(self.dumps_dir)
+                if filename.endswith('.json') and not filename.startswith('.')
+            ]
+            self._reset_dump_store()
+            self.dumps = None
+
+            self.log_info(f"Found {len(self._dump_files)} dumps")
+
+        except Exception as e:
+            self.log_error(f"Failed to index dumps: {e}")
+
+    def _ensure_dumps_loaded(self) -> List[dict]:
+        """Parse indexed dump files on first access"""
+        if self.dumps is None:
+            self._reset_dump_store()
+            for filepath in self._dump_files:
+                try:
+                    with open(filepath, 'rb') as f:
+                        self._add_dump(*self._decode_dump(_json_loads(f.read())))
+                except Exception as e:
+                    self.log_error(f"Failed to load dump {filepath}: {e}")
 
             self.log_info(f"Loaded {len(self.dumps)} dumps")
 
+        return self.dumps
+
+    def _reset_dump_store(self):
+        """Drop all parsed dumps and their block storage"""
+        self.dumps = []
+        self.dump_blocks = np.zeros((0, DUMP_MAX_SECTORS, DUMP_SECTOR_SIZE), dtype=np.uint8)
+        self.dump_sectors = np.zeros((0, DUMP_MAX_SECTORS), dtype=bool)
+        self.dump_count = 0
+        self._dump_keys.clear()
+
+    def _add_dump(self, dump: dict, sectors: dict):
+        """
+        Add dump to self.dumps, skipping duplicates by UID and timestamp.
+
+        Args:
+            dump: Dump metadata (uid, uid_str, type, timestamp)
+            sectors: Sector number -> sector data bytes
+        """
+        key = (tuple(dump['uid']), dump['timestamp'])
+        if key in self._dump_keys:
+            return
+
+        # Grow block storage geometrically
+        row = self.dump_count
+        if row == len(self.dump_blocks):
+            capacity = max(8, 2 * row)
+            blocks = np.zeros((capacity, DUMP_MAX_SECTORS, DUMP_SECTOR_SIZE), dtype=np.uint8)
+            present = np.zeros((capacity, DUMP_MAX_SECTORS), dtype=bool)
+            blocks[:row] = self.dump_blocks[:row]
+            present[:row] = self.dump_sectors[:row]
+            self.dump_blocks = blocks
+            self.dump_sectors = present
+
+        for sector, data in sectors.items():
+            self.dump_blocks[row, sector, :len(data)] = np.frombuffer(data, dtype=np.uint8)
+            self.dump_sectors[row, sector] = True
+
+        dump['row'] = row
+        self.dump_count += 1
+        self._dump_keys.add(key)
+        self.dumps.append(dump)
+
+    def _decode_dump(self, dump: dict) -> Tuple[dict, dict]:
+        """Split a parsed dump file into metadata and sector data bytes"""
+        sectors = {}
+        for sector, data in dump.pop('sectors').items():
+            if isinstance(data, str):
+                sectors[int(sector)] = base64.b64decode(data)
+            else:
+                # Legacy dumps: list of 4 blocks as int lists
+                sectors[int(sector)] = bytes(b for block in data for b in block)
+        dump['uid_str'] = _format_uid(dump['uid'])
+        return dump, sectors
+
+    def _load_keycache(self) -> dict:
+        """Загрузка кэша найденных ключей"""
+        if not os.path.exists(self._key_cache_file):
+            return {}
+
+        try:
+            with open(self._key_cache_file, 'rb') as f:
+                data = _json_loads(f.read())
+
+            # JSON object keys are strings, sectors are ints; keys are hex
+            return {
+                uid_hex: {
+                    int(sector): (key_type, bytes.fromhex(key))
+                    for sector, (key_type, key) in sectors.items()
+                    if isinstance(key, str)
+                }
+                for uid_hex, sectors in data.items()
+            }
+
+        except Exception as e:
+            self.log_error(f"Failed to load key cache: {e}")
+            return {}
+
+    def _save_keycache(self):
+        """Сохранение кэша найденных ключей"""
+        # Snapshot under the lock, write the file outside it
+        with self._key_cache_lock:
+            if not self._key_cache_dirty:
+                return
+
+            data = {
+                uid_hex: {str(sector): [key_type, key.hex()] for sector, (key_type, key) in sectors.items()}
+                for uid_hex, sectors in self._key_cache.items()
+            }
+            self._key_cache_dirty = False
+
+        try:
+            with open(self._key_cache_file, 'wb') as f:
+                f.write(_json_dumps(data))
+
         except Exception as e:
-            self.log_error(f"Failed to load dumps: {e}")
+            self.log_error(f"Failed to save key cache: {e}")
+            # Retry on the next flush
+            with self._key_cache_lock:
+                self._key_cache_dirty = True
+
+    def _schedule_keycache_flush(self):
+        """Save key cache once no new keys arrived for KEYCACHE_FLUSH_DELAY"""
+        if self._key_cache_timer is not None:
+            self._key_cache_timer.cancel()
+
+        self._key_cache_timer = threading.Timer(KEYCACHE_FLUSH_DELAY, self._save_keycache)
+        self._key_cache_timer.daemon = True
+        self._key_cache_timer.start()
+
+    def _load_key_dictionary(self, path: Optional[str]) -> bytes:
+        """
+        Load user key dictionary (one hex key per line, # comments).
+
+        Returns:
+            Concatenated 6-byte keys
+        """
+        if not path or not os.path.exists(path):
+            return b''
+
+        keys = bytearray()
+        try:
+            with open(path, 'r') as f:
+                for line in f:
+                    line = line.split('#', 1)[0].strip()
+                    if not line:
+                        continue
+                    try:
+                        key = bytes.fromhex(line)
+                    except ValueError:
+                        key = b''
+                    if len(key) != 6:
+                        self.log_warning(f"Skipping invalid key: {line}")
+                        continue
+                    keys += key
+
+            self.log_info(f"Loaded {len(keys) // 6} user keys from {path}")
+
+        except Exception as e:
+            self.log_error(f"Failed to load key dictionary: {e}")
+
+        return bytes(keys)
 
     def _delete_dump(self):
         """Удаление дампа"""
@@ -417,12 +750,12 @@ class NFCModule(BaseModule):
             settings_text += f"Interface: {self.pn532.interface}\n\n"
 
             settings_text += f"Default keys loaded: {len(self.default_keys)}\n"
-            settings_text += f"Saved dumps: {len(self.dumps)}\n"
+            settings_text += f"User keys loaded: {len(self.user_keys) // 6}\n"
+            settings_text += f"Saved dumps: {len(self._dump_files)}\n"
             settings_text += f"Dumps directory: {self.dumps_dir}\n\n"
 
             if self.last_card:
-                uid = ':'.join([f"{b:02X}" for b in self.last_card['uid']])
-                settings_text += f"Last card: {uid}\n"
+                settings_text += f"Last card: {self.last_card['uid_str']}\n"
                 settings_text += f"Type: {self.last_card['type']}\n"
         else:
             settings_text += "Status: Not available\n\n"
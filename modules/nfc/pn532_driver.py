@@ -4,8 +4,10 @@ PN532 Driver - драйвер для NFC/RFID контроллера PN532
 """
 
 import time
+import struct
 import logging
-from typing import Optional, List, Tuple
+import threading
+from typing import Optional, Tuple
 
 try:
     import spidev
@@ -13,6 +15,12 @@ try:
 except ImportError:
     SPI_AVAILABLE = False
 
+try:
+    from smbus2 import SMBus, i2c_msg
+    SMBUS_AVAILABLE = True
+except ImportError:
+    SMBUS_AVAILABLE = False
+
 try:
     import OPi.GPIO as GPIO
     GPIO_AVAILABLE = True
@@ -64,6 +72,28 @@ MIFARE_CMD_INCREMENT = 0xC1
 MIFARE_CMD_RESTORE = 0xC2
 MIFARE_CMD_TRANSFER = 0xB0
 
+# Default Mifare Classic keys, 6 bytes each, in one contiguous table
+DEFAULT_KEYS = bytes.fromhex(
+    "ffffffffffff"  # Factory default
+    "a0a1a2a3a4a5"  # MAD key
+    "d3f7d3f7d3f7"  # NDEF key
+    "000000000000"  # All zeros
+    "b0b1b2b3b4b5"  # Common key
+    "4d3a99c351dd"  # Common key 2
+    "1a982c7e459a"  # Common key 3
+)
+DEFAULT_KEYS_MV = memoryview(DEFAULT_KEYS)
+
+# SAK -> card type
+_SAK_CARD_TYPES = {
+    0x08: "Mifare Classic 1K",
+    0x18: "Mifare Classic 4K",
+    0x00: "Mifare Ultralight",
+    0x20: "Mifare DESFire",
+    0x28: "JCOP 31/41",
+    0x09: "Mifare Mini",
+}
+
 # PN532 Frame markers
 PN532_PREAMBLE = 0x00
 PN532_STARTCODE1 = 0x00
@@ -73,11 +103,76 @@ PN532_POSTAMBLE = 0x00
 PN532_HOSTTOPN532 = 0xD4
 PN532_PN532TOHOST = 0xD5
 
+# SPI operation prefixes
+PN532_SPI_STATREAD = 0x02
+PN532_SPI_DATAWRITE = 0x01
+PN532_SPI_DATAREAD = 0x03
+
+# Frame header (preamble + start codes)
+_HDR = bytes((PN532_PREAMBLE, PN532_STARTCODE1, PN532_STARTCODE2))
+
+# Two's complement of a byte, used for LCS and DCS
+LCS_TABLE = bytes((-i) & 0xFF for i in range(256))
+
+# Response frame header: preamble, start code 1, start code 2, LEN, LCS
+_FRAME_HDR = struct.Struct("BBBBB")
+# InListPassiveTarget target data: SENS_RES (ATQA), SEL_RES (SAK), NFCID length
+_TARGET_INFO = struct.Struct("<HBB")
+
+# Response LEN (TFI + data) bounds, they size the SPI read of a response
+PN532_MAX_LEN = 255  # Normal information frame
+_LEN_STATUS = 3  # TFI, response code, status
+_LEN_BLOCK = _LEN_STATUS + 16  # ... + one Mifare block
+_LEN_FWVER = 6  # TFI, response code, IC, Ver, Rev, Support
+
 # ACK and NACK
 PN532_ACK = bytes([0x00, 0x00, 0xFF, 0x00, 0xFF, 0x00])
 PN532_NACK = bytes([0x00, 0x00, 0xFF, 0xFF, 0x00, 0x00])
 
 
+def _build_frame(cmd: int, params: bytes = b'') -> bytearray:
+    """
+    Build a host-to-PN532 information frame.
+
+    The frame starts with the SPI DATAWRITE prefix; I2C writes skip it.
+
+    Args:
+        cmd: PN532 command code
+        params: Command parameters
+
+    Returns:
+        [SPI DW] PREAMBLE SC1 SC2 LEN LCS TFI CMD params... DCS POSTAMBLE
+    """
+    # Frame length covers TFI + command + params
+    n = len(params) + 2
+
+    buf = bytearray(n + 8)
+    buf[0] = PN532_SPI_DATAWRITE
+    buf[1:4] = _HDR
+    buf[4] = n
+    buf[5] = LCS_TABLE[n]
+    buf[6] = PN532_HOSTTOPN532
+    buf[7] = cmd
+    buf[8:8 + n - 2] = params
+    buf[-2] = LCS_TABLE[sum(memoryview(buf)[6:-2]) & 0xFF]
+    buf[-1] = PN532_POSTAMBLE
+    return buf
+
+
+# Commands sent with constant parameters, framed once at import
+_FRAME_GETFWVER = bytes(_build_frame(PN532_COMMAND_GETFIRMWAREVERSION))
+_FRAME_SAM_DEFAULT = bytes(_build_frame(PN532_COMMAND_SAMCONFIGURATION, b'\x01\x14\x01'))
+_FRAME_SETPARAMS_NAD = bytes(_build_frame(PN532_COMMAND_SETPARAMETERS, b'\x01'))
+# An ACK from the host aborts the command the PN532 is still processing
+_FRAME_ABORT = bytes((PN532_SPI_DATAWRITE,)) + PN532_ACK
+
+# InListPassiveTarget frames (one target) for each card_type, used by polling
+_POLL_FRAMES = {
+    card_type: bytes(_build_frame(PN532_COMMAND_INLISTPASSIVETARGET, bytes((0x01, card_type))))
+    for card_type in (0x00, 0x01, 0x02)  # ISO14443A, FeliCa, ISO14443B
+}
+
+
 class PN532:
     """
     PN532 NFC/RFID контроллер driver.
@@ -90,9 +185,13 @@ class PN532:
     - Card emulation (HCE)
     """
 
+    # SPI clocks probed at initialize(), fastest first (PN532 is rated to 5 MHz)
+    SPI_SPEEDS_HZ = (5000000, 4000000, 2000000, 1000000)
+
     def __init__(self, interface: str = 'spi', spi_bus: int = 1, spi_device: int = 2,
                  cs_pin: int = 23, reset_pin: Optional[int] = None,
-                 i2c_bus: int = 0, i2c_address: int = 0x24):
+                 i2c_bus: int = 0, i2c_address: int = 0x24,
+                 irq_pin: Optional[int] = None):
         """
         Initialize PN532 driver.
 
@@ -100,10 +199,13 @@ class PN532:
             interface: 'spi', 'i2c', or 'uart'
             spi_bus: SPI bus number
             spi_device: SPI device number
-            cs_pin: Chip select GPIO pin (for SPI)
+            cs_pin: Chip select pin (for SPI). Informational only: CS is the
+                hardware CE line of spi_device and is driven by the kernel
+                SPI driver, never toggled through GPIO
             reset_pin: Reset GPIO pin (optional)
             i2c_bus: I2C bus number
             i2c_address: I2C address
+            irq_pin: IRQ GPIO pin (optional, avoids status polling)
         """
         self.logger = logging.getLogger("cyberdeck.pn532")
 
@@ -112,6 +214,8 @@ class PN532:
         self.i2c = None
         self.cs_pin = cs_pin
         self.reset_pin = reset_pin
+        self.irq_pin = irq_pin
+        self._irq_event = None
         self.enabled = False
 
         # GPIO setup for reset
@@ -129,7 +233,7 @@ class PN532:
             try:
                 self.spi = spidev.SpiDev()
                 self.spi.open(spi_bus, spi_device)
-                self.spi.max_speed_hz = 1000000  # 1 MHz
+                self.spi.max_speed_hz = 1000000  # 1 MHz until probed in initialize()
                 self.spi.mode = 0
                 self.logger.info(f"PN532 SPI opened: {spi_bus}.{spi_device}")
             except Exception as e:
@@ -137,9 +241,12 @@ class PN532:
                 return
 
         elif interface == 'i2c':
+            if not SMBUS_AVAILABLE:
+                self.logger.error("smbus2 not available")
+                return
+
             try:
-                import smbus
-                self.i2c = smbus.SMBus(i2c_bus)
+                self.i2c = SMBus(i2c_bus)
                 self.i2c_address = i2c_address
                 self.logger.info(f"PN532 I2C opened: bus {i2c_bus}, addr 0x{i2c_address:02X}")
             except Exception as e:
@@ -161,12 +268,27 @@ class PN532:
         if self.reset_pin:
             self._hardware_reset()
 
+        # IRQ line goes low when the PN532 has data ready
+        if self.irq_pin and GPIO_AVAILABLE and self._irq_event is None:
+            try:
+                GPIO.setmode(GPIO.BOARD)
+                GPIO.setup(self.irq_pin, GPIO.IN)
+                self._irq_event = threading.Event()
+                GPIO.add_event_detect(self.irq_pin, GPIO.FALLING,
+                                      callback=lambda channel: self._irq_event.set())
+            except Exception as e:
+                self.logger.warning(f"IRQ pin unavailable, using polling: {e}")
+                self._irq_event = None
+
         # Wake up PN532
         self._wakeup()
         time.sleep(0.5)
 
         # Get firmware version
-        version = self.get_firmware_version()
+        if self.interface == 'spi':
+            version = self._probe_spi_speed()
+        else:
+            version = self.get_firmware_version()
         if not version:
             self.logger.error("PN532 not responding")
             return False
@@ -185,6 +307,28 @@ class PN532:
         self.enabled = True
         return True
 
+    def _probe_spi_speed(self) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Find the fastest SPI clock the PN532 answers reliably at.
+
+        Returns:
+            Firmware version from the first successful probe or None
+        """
+        for hz in self.SPI_SPEEDS_HZ:
+            try:
+                self.spi.max_speed_hz = hz
+            except IOError:
+                continue
+
+            version = self.get_firmware_version()
+            if version:
+                self.logger.info(f"PN532 SPI clock: {hz // 1000} kHz")
+                return version
+
+            self.logger.debug("PN532 not responding at %d Hz", hz)
+
+        return None
+
     def _hardware_reset(self):
         """Hardware reset via reset pin"""
         if self.reset_pin and GPIO_AVAILABLE:
@@ -200,44 +344,110 @@ class PN532:
             self.spi.xfer2([0x00] * 10)
             time.sleep(0.01)
 
-    def _write_command(self, cmd: int, params: List[int] = None):
+    def _write_command(self, cmd: int, params: bytes = b''):
         """Write command to PN532"""
-        if params is None:
-            params = []
+        self._write_raw_frame(_build_frame(cmd, params))
 
-        # Build frame
-        frame = [PN532_HOSTTOPN532, cmd] + params
+    def _write_raw_frame(self, frame: bytes):
+        """Write a complete frame built by _build_frame()"""
+        if self.interface == 'spi':
+            self.spi.xfer2(frame)
+        elif self.interface == 'i2c':
+            # Raw I2C write without SPI prefix (no SMBus register byte)
+            self.i2c.i2c_rdwr(i2c_msg.write(self.i2c_address, frame[1:]))
 
-        # Calculate checksum
-        checksum = (~sum(frame) + 1) & 0xFF
+    def _i2c_read(self, n: int) -> Optional[bytes]:
+        """
+        Read n frame bytes over I2C.
 
-        # Build full packet
-        packet = [
-            PN532_PREAMBLE,
-            PN532_STARTCODE1,
-            PN532_STARTCODE2,
-            len(frame),
-            (~len(frame) + 1) & 0xFF
-        ] + frame + [checksum, PN532_POSTAMBLE]
+        Every I2C read starts with a status byte and restarts the frame
+        from the beginning, so the same frame can be read in several parts.
 
-        if self.interface == 'spi':
-            # SPI write (add 0x01 prefix for SPI mode)
-            self.spi.xfer2([0x01] + packet)
-        elif self.interface == 'i2c':
-            # I2C write
-            self.i2c.write_i2c_block_data(self.i2c_address, 0, packet)
+        Returns:
+            Frame bytes or None if PN532 is not ready
+        """
+        msg = i2c_msg.read(self.i2c_address, n + 1)
+        self.i2c.i2c_rdwr(msg)
+        data = bytes(msg)
+
+        if not data[0] & 0x01:
+            return None
+        return data[1:]
+
+    def _command(self, cmd: int, params: bytes = b'', timeout: float = 1.0,
+                 max_len: int = PN532_MAX_LEN) -> Optional[bytes]:
+        """
+        Send command and read its response.
+
+        Args:
+            cmd: PN532 command code
+            params: Command parameters
+            timeout: Response timeout in seconds
+            max_len: Largest expected response LEN (TFI + data)
+
+        Returns:
+            Response data (starting with cmd+1) or None
+        """
+        return self._command_frame(_build_frame(cmd, params), timeout=timeout, max_len=max_len)
+
+    def _command_frame(self, frame: bytes, timeout: float = 1.0,
+                       max_len: int = PN532_MAX_LEN) -> Optional[bytes]:
+        """
+        Send a prebuilt command frame and read its response.
+
+        Args:
+            frame: Frame from _build_frame()
+            timeout: Response timeout in seconds
+            max_len: Largest expected response LEN (TFI + data)
+
+        Returns:
+            Response data (starting with cmd+1) or None
+        """
+        self._write_raw_frame(frame)
+
+        if not self._read_ack():
+            self.logger.debug("PN532 cmd 0x%02X: no ACK", frame[7])
+            return None
 
-        time.sleep(0.01)
+        response = self._read_response(timeout=timeout, max_len=max_len)
+
+        # Hex dumps are only built when DEBUG is actually enabled
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("PN532 cmd 0x%02X [%s] -> %s", frame[7], bytes(frame[8:-2]).hex(),
+                              response.hex() if response is not None else None)
+
+        if response is None:
+            # Still running (e.g. no card in the field) - abort it, or its late
+            # reply would be read as the response to the next command
+            self._write_raw_frame(_FRAME_ABORT)
+        elif not response or response[0] != frame[7] + 1:
+            self.logger.debug("PN532 cmd 0x%02X: response to another command", frame[7])
+            return None
+
+        return response
+
+    def _is_ready(self) -> bool:
+        """Check if PN532 has data ready (SPI)"""
+        if self._irq_event is not None:
+            # IRQ is held low while data is pending - no status transfer needed
+            return GPIO.input(self.irq_pin) == GPIO.LOW
+        return bool(self.spi.xfer2([PN532_SPI_STATREAD, 0x00])[1] & 0x01)
+
+    def _wait_irq(self, deadline: int):
+        """Wait for IRQ (or a short poll interval without IRQ line)"""
+        if self._irq_event is not None:
+            self._irq_event.wait(max(0, deadline - time.monotonic_ns()) / 1e9)
+            self._irq_event.clear()
+        else:
+            time.sleep(0.001)
 
     def _read_ack(self, timeout: float = 1.0) -> bool:
         """Wait for ACK response"""
-        start_time = time.time()
+        deadline = time.monotonic_ns() + int(timeout * 1e9)
 
-        while (time.time() - start_time) < timeout:
+        while time.monotonic_ns() < deadline:
             if self.interface == 'spi':
-                # SPI read status
-                status = self.spi.xfer2([0x02, 0x00])[1]
-                if status & 0x01:  # Ready
+                if self._is_ready():
                     # Read ACK
                     data = self.spi.xfer2([0x03] + [0x00] * 6)[1:]
                     if bytes(data) == PN532_ACK:
@@ -245,77 +455,86 @@ class PN532:
             elif self.interface == 'i2c':
                 # I2C read
                 try:
-                    data = self.i2c.read_i2c_block_data(self.i2c_address, 0, 6)
-                    if bytes(data) == PN532_ACK:
+                    if self._i2c_read(len(PN532_ACK)) == PN532_ACK:
                         return True
                 except:
                     pass
 
-            time.sleep(0.01)
+            self._wait_irq(deadline)
 
         return False
 
-    def _read_response(self, timeout: float = 1.0) -> Optional[List[int]]:
-        """Read response from PN532"""
-        start_time = time.time()
+    def _read_response(self, timeout: float = 1.0, max_len: int = PN532_MAX_LEN) -> Optional[bytes]:
+        """
+        Read response from PN532.
 
-        while (time.time() - start_time) < timeout:
+        Args:
+            timeout: Response timeout in seconds
+            max_len: Largest expected response LEN (TFI + data), bounds the SPI read
+
+        Returns:
+            Response data (starting with cmd+1) or None
+        """
+        deadline = time.monotonic_ns() + int(timeout * 1e9)
+
+        while time.monotonic_ns() < deadline:
             if self.interface == 'spi':
                 # Check if data ready
-                status = self.spi.xfer2([0x02, 0x00])[1]
-                if not (status & 0x01):
-                    time.sleep(0.01)
+                if not self._is_ready():
+                    self._wait_irq(deadline)
                     continue
 
-                # Read response (max 255 bytes)
-                response = self.spi.xfer2([0x03] + [0x00] * 255)[1:]
+                # Read the whole frame up to DCS in one transaction, sized for
+                # the largest expected response. The byte clocked out during
+                # the DATAREAD byte itself is not frame data.
+                response = bytes(self.spi.xfer2(
+                    [PN532_SPI_DATAREAD] + [0x00] * (_FRAME_HDR.size + max_len + 1))[1:])
+                preamble, start1, start2, length, length_checksum = _FRAME_HDR.unpack_from(response)
 
                 # Find start of frame
-                if response[0] != PN532_PREAMBLE:
+                if preamble != PN532_PREAMBLE:
                     continue
-                if response[1] != PN532_STARTCODE1 or response[2] != PN532_STARTCODE2:
+                if start1 != PN532_STARTCODE1 or start2 != PN532_STARTCODE2:
                     continue
 
-                # Get length
-                length = response[3]
-                length_checksum = response[4]
-
                 # Verify length checksum
                 if (length + length_checksum) & 0xFF != 0:
                     continue
 
-                # Extract frame
-                frame = response[5:5 + length]
+                if length > max_len:
+                    self.logger.debug("PN532 response LEN %d exceeds expected %d", length, max_len)
+                    return None
 
-                # Verify checksum
-                checksum = response[5 + length]
-                if (sum(frame) + checksum) & 0xFF != 0:
+                # Verify checksum: TFI + data + DCS sums to zero
+                if sum(memoryview(response)[5:6 + length]) & 0xFF:
                     continue
 
                 # Return data (skip PN532TOHOST byte)
-                if frame[0] == PN532_PN532TOHOST:
-                    return frame[1:]
+                if response[5] == PN532_PN532TOHOST:
+                    return response[6:5 + length]
 
             elif self.interface == 'i2c':
                 try:
-                    # Read response
-                    response = self.i2c.read_i2c_block_data(self.i2c_address, 0, 255)
-
-                    # Same parsing as SPI
-                    if response[0] != PN532_PREAMBLE:
-                        time.sleep(0.01)
-                        continue
-
-                    length = response[3]
-                    frame = response[5:5 + length]
-
-                    if frame[0] == PN532_PN532TOHOST:
-                        return frame[1:]
+                    # Read header first to learn the frame length
+                    header = self._i2c_read(_FRAME_HDR.size)
+                    if header is not None:
+                        preamble, start1, start2, length, length_checksum = _FRAME_HDR.unpack(header)
+
+                        if (preamble == PN532_PREAMBLE and start1 == PN532_STARTCODE1
+                                and start2 == PN532_STARTCODE2
+                                and (length + length_checksum) & 0xFF == 0):
+                            # Re-read the whole frame up to DCS in one transaction
+                            response = self._i2c_read(5 + length + 1)
+
+                            if (response is not None
+                                    and not sum(memoryview(response)[5:6 + length]) & 0xFF
+                                    and response[5] == PN532_PN532TOHOST):
+                                return response[6:5 + length]
 
                 except:
                     pass
 
-            time.sleep(0.01)
+            self._wait_irq(deadline)
 
         return None
 
@@ -326,12 +545,7 @@ class PN532:
         Returns:
             Tuple of (IC, Ver, Rev, Support) or None
         """
-        self._write_command(PN532_COMMAND_GETFIRMWAREVERSION)
-
-        if not self._read_ack():
-            return None
-
-        response = self._read_response()
+        response = self._command_frame(_FRAME_GETFWVER, max_len=_LEN_FWVER)
         if not response or len(response) < 5:
             return None
 
@@ -350,12 +564,10 @@ class PN532:
         Returns:
             bool: True if successful
         """
-        self._write_command(PN532_COMMAND_SAMCONFIGURATION, [mode, timeout, irq])
-
-        if not self._read_ack():
-            return False
-
-        response = self._read_response()
+        if (mode, timeout, irq) == (0x01, 0x14, 0x01):
+            response = self._command_frame(_FRAME_SAM_DEFAULT)
+        else:
+            response = self._command(PN532_COMMAND_SAMCONFIGURATION, bytes((mode, timeout, irq)))
         return response is not None
 
     def set_passive_activation_retries(self, retries: int = 0xFF) -> bool:
@@ -368,12 +580,7 @@ class PN532:
         Returns:
             bool: True if successful
         """
-        self._write_command(PN532_COMMAND_SETPARAMETERS, [0x01])  # NAD enabled
-
-        if not self._read_ack():
-            return False
-
-        response = self._read_response()
+        response = self._command_frame(_FRAME_SETPARAMS_NAD)  # NAD enabled
         return response is not None
 
     def read_passive_target(self, card_type: int = 0x00, timeout: float = 1.0) -> Optional[dict]:
@@ -387,12 +594,11 @@ class PN532:
         Returns:
             Card info dict or None
         """
-        self._write_command(PN532_COMMAND_INLISTPASSIVETARGET, [0x01, card_type])
+        frame = _POLL_FRAMES.get(card_type)
+        if frame is None:
+            frame = _build_frame(PN532_COMMAND_INLISTPASSIVETARGET, bytes((0x01, card_type)))
 
-        if not self._read_ack():
-            return None
-
-        response = self._read_response(timeout=timeout)
+        response = self._command_frame(frame, timeout=timeout)
         if not response or len(response) < 2:
             return None
 
@@ -403,9 +609,7 @@ class PN532:
 
         # Parse card info
         target_number = response[2]
-        sens_res = (response[4] << 8) | response[3]  # SENS_RES / ATQA
-        sel_res = response[5]  # SEL_RES / SAK
-        uid_length = response[6]
+        sens_res, sel_res, uid_length = _TARGET_INFO.unpack_from(response, 3)  # ATQA, SAK
         uid = response[7:7 + uid_length]
 
         return {
@@ -419,23 +623,10 @@ class PN532:
 
     def _identify_card_type(self, sak: int) -> str:
         """Identify card type from SAK"""
-        if sak == 0x08:
-            return "Mifare Classic 1K"
-        elif sak == 0x18:
-            return "Mifare Classic 4K"
-        elif sak == 0x00:
-            return "Mifare Ultralight"
-        elif sak == 0x20:
-            return "Mifare DESFire"
-        elif sak == 0x28:
-            return "JCOP 31/41"
-        elif sak == 0x09:
-            return "Mifare Mini"
-        else:
-            return f"Unknown (SAK: 0x{sak:02X})"
+        return _SAK_CARD_TYPES.get(sak) or f"Unknown (SAK: 0x{sak:02X})"
 
-    def mifare_classic_authenticate(self, uid: List[int], block: int, key_type: int = MIFARE_CMD_AUTH_A,
-                                    key: List[int] = None) -> bool:
+    def mifare_classic_authenticate(self, uid: bytes, block: int, key_type: int = MIFARE_CMD_AUTH_A,
+                                    key: bytes = b'\xFF' * 6) -> bool:
         """
         Authenticate Mifare Classic block.
 
@@ -443,21 +634,21 @@ class PN532:
             uid: Card UID
             block: Block number
             key_type: MIFARE_CMD_AUTH_A or MIFARE_CMD_AUTH_B
-            key: 6-byte key (default: FF FF FF FF FF FF)
+            key: 6-byte key as bytes/memoryview (default: FF FF FF FF FF FF)
 
         Returns:
             bool: True if authenticated
         """
-        if key is None:
-            key = [0xFF] * 6
-
-        params = [key_type, block] + key + uid[:4]
-        self._write_command(PN532_COMMAND_INDATAEXCHANGE, [0x01] + params)
-
-        if not self._read_ack():
-            return False
-
-        response = self._read_response()
+        uid4 = bytes(uid[:4])
+
+        # [Tg, auth cmd, block, key(6), uid(4)]
+        params = bytearray(9 + len(uid4))
+        params[0] = 0x01
+        params[1] = key_type
+        params[2] = block
+        params[3:9] = key
+        params[9:] = uid4
+        response = self._command(PN532_COMMAND_INDATAEXCHANGE, params, max_len=_LEN_STATUS)
         if not response or len(response) < 2:
             return False
 
@@ -465,22 +656,59 @@ class PN532:
         status = response[1]
         return status == 0x00
 
-    def mifare_classic_read_block(self, block: int) -> Optional[List[int]]:
+    def mifare_classic_authenticate_batch(self, uid: bytes, block: int, keys: bytes,
+                                          key_type: int = MIFARE_CMD_AUTH_A) -> Optional[int]:
         """
-        Read Mifare Classic block (must authenticate first).
+        Try a list of keys on one Mifare Classic block.
+
+        The InDataExchange parameter buffer is built once and only the key
+        bytes are replaced between attempts. A failed authentication halts
+        the card, so it is re-selected after each failure (and only then).
 
         Args:
+            uid: Card UID
             block: Block number
+            keys: Concatenated 6-byte keys (6 * N bytes)
+            key_type: MIFARE_CMD_AUTH_A or MIFARE_CMD_AUTH_B
 
         Returns:
-            16 bytes of data or None
+            Index of the first key that authenticated, or None (also when the card is lost)
         """
-        self._write_command(PN532_COMMAND_INDATAEXCHANGE, [0x01, MIFARE_CMD_READ, block])
+        keys = memoryview(keys)
+        uid4 = bytes(uid[:4])
+
+        # [Tg, auth cmd, block, key(6), uid(4)]
+        params = bytearray(9 + len(uid4))
+        params[0] = 0x01
+        params[1] = key_type
+        params[2] = block
+        params[9:] = uid4
+
+        for index in range(len(keys) // 6):
+            params[3:9] = keys[index * 6:index * 6 + 6]
+            response = self._command(PN532_COMMAND_INDATAEXCHANGE, params, max_len=_LEN_STATUS)
+            if response and len(response) >= 2 and response[1] == 0x00:
+                return index
+
+            # Card is muted after a failed auth - select it again
+            if self.read_passive_target(timeout=0.5) is None:
+                self.logger.debug("Card lost during key search")
+                return None
 
-        if not self._read_ack():
-            return None
+        return None
 
-        response = self._read_response()
+    def mifare_classic_read_block(self, block: int) -> Optional[bytes]:
+        """
+        Read Mifare Classic block (must authenticate first).
+
+        Args:
+            block: Block number
+
+        Returns:
+            16 bytes of data or None
+        """
+        response = self._command(PN532_COMMAND_INDATAEXCHANGE, bytes((0x01, MIFARE_CMD_READ, block)),
+                                 max_len=_LEN_BLOCK)
         if not response or len(response) < 3:
             return None
 
@@ -492,7 +720,37 @@ class PN532:
         # Return data (skip status byte)
         return response[2:]
 
-    def mifare_classic_write_block(self, block: int, data: List[int]) -> bool:
+    def mifare_classic_read_sector(self, first_block: int, num_blocks: int = 4) -> Optional[bytes]:
+        """
+        Read consecutive Mifare Classic blocks of one sector (must authenticate first).
+
+        Blocks are read back-to-back within the current authentication,
+        without returning to the caller between blocks.
+
+        Args:
+            first_block: First block number of the sector
+            num_blocks: Number of blocks in the sector
+
+        Returns:
+            num_blocks * 16 bytes of data or None
+        """
+        data = bytearray(num_blocks * 16)
+        params = bytearray((0x01, MIFARE_CMD_READ, 0x00))
+
+        for offset in range(num_blocks):
+            params[2] = first_block + offset
+            response = self._command(PN532_COMMAND_INDATAEXCHANGE, params, max_len=_LEN_BLOCK)
+
+            # Response: [cmd+1, status, 16 data bytes]
+            if not response or len(response) < 18 or response[1] != 0x00:
+                self.logger.debug("Failed to read block %d", first_block + offset)
+                return None
+
+            data[offset * 16:(offset + 1) * 16] = response[2:18]
+
+        return bytes(data)
+
+    def mifare_classic_write_block(self, block: int, data: bytes) -> bool:
         """
         Write Mifare Classic block (must authenticate first).
 
@@ -506,12 +764,9 @@ class PN532:
         if len(data) != 16:
             return False
 
-        self._write_command(PN532_COMMAND_INDATAEXCHANGE, [0x01, MIFARE_CMD_WRITE, block] + data)
-
-        if not self._read_ack():
-            return False
-
-        response = self._read_response()
+        response = self._command(PN532_COMMAND_INDATAEXCHANGE,
+                                 bytes((0x01, MIFARE_CMD_WRITE, block)) + bytes(data),
+                                 max_len=_LEN_STATUS)
         if not response or len(response) < 2:
             return False
 
@@ -520,6 +775,9 @@ class PN532:
 
     def close(self):
         """Close connection"""
+        if self._irq_event is not None:
+            GPIO.remove_event_detect(self.irq_pin)
+            self._irq_event = None
         if self.spi:
             self.spi.close()
         if GPIO_AVAILABLE and self.reset_pin:
@@ -5,6 +5,7 @@ nRF24L01+ Driver для Orange Pi
 Сканирование и джамминг 2.4 ГГц диапазона
 """
 
+import os
 import spidev
 import time
 import logging
@@ -59,12 +60,32 @@ NRF24_PLL_LOCK = 0x10   # Бит 4 - PLL lock для carrier wave
 # Биты FIFO_STATUS
 NRF24_TX_FULL = 0x20
 
+# Неизменяемые SPI-кадры частых команд
+_RPD_READ = bytes((NRF24_R_REGISTER | NRF24_RPD, 0xFF))
+_FLUSH_RX = bytes((NRF24_FLUSH_RX,))
+_FLUSH_TX = bytes((NRF24_FLUSH_TX,))
+
+# Окно приема на канал при сканировании (мкс)
+SCAN_RX_WINDOW_US = 100
+
+
+def _udelay(us: int):
+    """
+    Активное ожидание в микросекундах.
+
+    time.sleep() для интервалов в десятки мкс дает 50-100 мкс джиттера
+    планировщика, поэтому короткие окна отсчитываются по perf_counter_ns.
+    """
+    end = time.perf_counter_ns() + us * 1000
+    while time.perf_counter_ns() < end:
+        pass
+
 
 class NRF24Spectrum:
     """nRF24L01+ спектроанализатор и джаммер для 2.4 ГГц"""
 
     def __init__(self, ce_pin: int = 7, spi_bus: int = 0, spi_device: int = 0,
-                 lna_enable: bool = True, pa_level: int = 3):
+                 lna_enable: bool = True, pa_level: int = 3, ce_gpio: Optional[int] = None):
         """
         Инициализация спектроанализатора
 
@@ -78,6 +99,9 @@ class NRF24Spectrum:
                      1: -12 dBm (низкий)
                      2: -6 dBm (средний)
                      3: 0 dBm (высокий для обычного) / +20 dBm (для PA модуля)
+            ce_gpio: Номер GPIO пина CE в sysfs (опционально). Если задан,
+                     CE переключается записью в заранее открытый
+                     /sys/class/gpio/gpioN/value вместо вызова OPi.GPIO
         """
         self.logger = logging.getLogger("cyberdeck.nrf24")
 
@@ -90,12 +114,21 @@ class NRF24Spectrum:
         self.lna_enable = lna_enable
         self.pa_level = pa_level
         self.enabled = False
+        self.spi = None
+        self._ce_fd = None
 
         # Настройка GPIO
         GPIO.setmode(GPIO.BOARD)
         GPIO.setup(self.ce_pin, GPIO.OUT)
         GPIO.output(self.ce_pin, GPIO.LOW)
 
+        # Быстрый CE: пин уже экспортирован OPi.GPIO, держим value открытым
+        if ce_gpio is not None:
+            try:
+                self._ce_fd = os.open(f"/sys/class/gpio/gpio{ce_gpio}/value", os.O_WRONLY)
+            except OSError as e:
+                self.logger.warning(f"CE sysfs value unavailable, using OPi.GPIO: {e}")
+
         # Настройка SPI
         self.spi = spidev.SpiDev()
         try:
@@ -110,6 +143,12 @@ class NRF24Spectrum:
         # Диапазон каналов (0-125, что соответствует 2400-2525 МГц)
         self.num_channels = 126
 
+        # Готовые SPI-кадры записи RF_CH для каждого канала
+        self._rf_ch_frames = [
+            bytes((NRF24_W_REGISTER | NRF24_RF_CH, channel))
+            for channel in range(self.num_channels)
+        ]
+
         # Инициализация радиомодуля
         self.init_radio()
         self.enabled = True
@@ -128,11 +167,17 @@ class NRF24Spectrum:
 
     def ce_high(self):
         """CE в HIGH"""
-        GPIO.output(self.ce_pin, GPIO.HIGH)
+        if self._ce_fd is not None:
+            os.write(self._ce_fd, b'1')
+        else:
+            GPIO.output(self.ce_pin, GPIO.HIGH)
 
     def ce_low(self):
         """CE в LOW"""
-        GPIO.output(self.ce_pin, GPIO.LOW)
+        if self._ce_fd is not None:
+            os.write(self._ce_fd, b'0')
+        else:
+            GPIO.output(self.ce_pin, GPIO.LOW)
 
     def init_radio(self):
         """Инициализация радиомодуля для работы в режиме сканирования"""
@@ -155,8 +200,8 @@ class NRF24Spectrum:
         self.write_register(NRF24_CONFIG, NRF24_PWR_UP | NRF24_PRIM_RX)
 
         # Очистка FIFO
-        self.spi.xfer2([NRF24_FLUSH_RX])
-        self.spi.xfer2([NRF24_FLUSH_TX])
+        self.spi.xfer2(_FLUSH_RX)
+        self.spi.xfer2(_FLUSH_TX)
 
         time.sleep(0.005)  # Время на включение (5 мс)
 
@@ -178,30 +223,42 @@ class NRF24Spectrum:
         Returns:
             True если обнаружена активность
         """
-        # Устанавливаем канал
-        self.write_register(NRF24_RF_CH, channel)
+        # Устанавливаем канал (готовый кадр RF_CH)
+        self.spi.xfer2(self._rf_ch_frames[channel])
 
         # Запускаем прием
         self.ce_high()
-        time.sleep(0.0001)  # 100 мкс на прием
+        _udelay(SCAN_RX_WINDOW_US)
         self.ce_low()
 
         # Читаем RPD (Received Power Detector)
-        rpd = self.read_register(NRF24_RPD)
+        rpd = self.spi.xfer2(_RPD_READ)[1]
 
         return rpd > 0
 
-    def scan_spectrum(self) -> List[int]:
+    def scan_spectrum(self) -> bytearray:
         """
         Сканирование всего спектра
 
         Returns:
-            список активности по каналам (0-125)
+            активность по каналам (0-125), по байту 0/1 на канал
         """
-        spectrum = []
+        # Тот же цикл, что в scan_channel, но без вызова метода на канал:
+        # готовые кадры RF_CH и локальные ссылки на xfer2/CE
+        xfer = self.spi.xfer2
+        ce_high = self.ce_high
+        ce_low = self.ce_low
+        frames = self._rf_ch_frames
+        spectrum = bytearray(self.num_channels)
         for channel in range(self.num_channels):
-            active = self.scan_channel(channel)
-            spectrum.append(1 if active else 0)
+            xfer(frames[channel])
+
+            ce_high()
+            _udelay(SCAN_RX_WINDOW_US)
+            ce_low()
+
+            if xfer(_RPD_READ)[1] > 0:
+                spectrum[channel] = 1
         return spectrum
 
     def setup_jamming_mode(self):
@@ -382,6 +439,9 @@ class NRF24Spectrum:
     def cleanup(self):
         """Освобождение ресурсов"""
         self.ce_low()
+        if self._ce_fd is not None:
+            os.close(self._ce_fd)
+            self._ce_fd = None
         if self.spi:
             self.spi.close()
         if GPIO_AVAILABLE:
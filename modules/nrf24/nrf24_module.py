@@ -4,8 +4,49 @@ nRF24L01+ Module - 2.4GHz спектроанализатор и джаммер
 
 from core.base_module import BaseModule
 from typing import List, Tuple, Callable
+from collections import deque
+import threading
 import time
 
+import numpy as np
+
+# Safety limit for every jamming run (seconds)
+JAM_TIME_LIMIT = 30.0
+
+# Scans averaged by the spectrum analyzer (= background snapshots kept)
+ANALYZER_SCANS = 10
+
+
+def _lane_mask(channels) -> int:
+    """Маска каналов по байтовым полосам: канал N -> бит 8*N"""
+    return sum(1 << (8 * ch) for ch in channels)
+
+
+# Band masks over int.from_bytes(spectrum, 'little') (one byte per channel)
+_WIFI_MASKS = (
+    (1, _lane_mask(range(7, 18))),    # WiFi канал 1: 2412 МГц
+    (6, _lane_mask(range(32, 43))),   # WiFi канал 6: 2437 МГц
+    (11, _lane_mask(range(57, 68))),  # WiFi канал 11: 2462 МГц
+)
+_BLUETOOTH_MASK = _lane_mask(range(2, 81))
+
+
+def _fold_spectrum(scans: np.ndarray, threshold: float) -> Tuple[np.ndarray, int, np.ndarray]:
+    """
+    Свертка серии сканов в суммарную активность по каналам.
+
+    Args:
+        scans: Матрица (число сканов, число каналов) из 0/1
+        threshold: Порог горячих точек как доля от максимума
+
+    Returns:
+        (суммарная активность, максимум, индексы каналов выше порога)
+    """
+    accumulated = scans.sum(axis=0, dtype=np.int32)
+    max_activity = int(accumulated.max())
+    hot = np.flatnonzero(accumulated > max_activity * threshold)
+    return accumulated, max_activity, hot
+
 
 class NRF24Module(BaseModule):
     """
@@ -28,8 +69,16 @@ class NRF24Module(BaseModule):
 
         self.scanner = None
         self.jamming_active = False
-        self.scan_history = []
         self.max_history = 100
+        self.scan_history = deque(maxlen=self.max_history)  # oldest scans drop off
+
+        # Background scanner: the worker appends fresh spectra here, the UI
+        # only reads them (deque append/index are atomic under the GIL)
+        self.scan_interval = 0.5
+        self._snapshots = deque(maxlen=ANALYZER_SCANS)
+        self._scan_thread = None
+        self._scan_stop = threading.Event()
+        self._radio_lock = threading.Lock()  # one SPI user at a time (scan/jam)
 
     def on_load(self):
         """Инициализация модуля"""
@@ -49,6 +98,8 @@ class NRF24Module(BaseModule):
         spi_device = nrf24_config.get('spi_device', 0)
         lna_enable = nrf24_config.get('lna_enable', True)
         pa_level = nrf24_config.get('pa_level', 3)
+        ce_gpio = nrf24_config.get('ce_gpio', None)
+        self.scan_interval = nrf24_config.get('background_scan_interval', 0.5)
 
         try:
             from .nrf24_driver import NRF24Spectrum
@@ -58,12 +109,14 @@ class NRF24Module(BaseModule):
                 spi_bus=spi_bus,
                 spi_device=spi_device,
                 lna_enable=lna_enable,
-                pa_level=pa_level
+                pa_level=pa_level,
+                ce_gpio=ce_gpio
             )
 
             if self.scanner.enabled:
                 self.log_info(f"nRF24L01+ initialized on SPI {spi_bus}.{spi_device}")
                 self.enabled = True
+                self._start_scan_worker()
             else:
                 self.log_error("nRF24L01+ initialization failed")
                 self.enabled = False
@@ -74,8 +127,12 @@ class NRF24Module(BaseModule):
 
     def on_unload(self):
         """Освобождение ресурсов"""
+        self._stop_scan_worker()
         if self.scanner:
-            self.scanner.cleanup()
+            # A worker that outlived the join still can't touch the radio:
+            # it re-checks the stop flag once it gets the lock
+            with self._radio_lock:
+                self.scanner.cleanup()
         self.log_info("nRF24 module unloaded")
 
     def get_menu_items(self) -> List[Tuple[str, Callable]]:
@@ -104,6 +161,50 @@ class NRF24Module(BaseModule):
 
     # ========== Scanning Functions ==========
 
+    def _start_scan_worker(self):
+        """Запуск фонового сканирования (scan_interval <= 0 - выключено)"""
+        if self.scan_interval <= 0 or self._scan_thread is not None:
+            return
+
+        self._scan_stop.clear()
+        self._scan_thread = threading.Thread(target=self._scan_worker, daemon=True)
+        self._scan_thread.start()
+
+    def _stop_scan_worker(self):
+        """Остановка фонового сканирования"""
+        if self._scan_thread is None:
+            return
+
+        # Signalled before anything takes _radio_lock, so a worker waiting
+        # on the lock (e.g. behind a jamming run) exits without scanning
+        self._scan_stop.set()
+        self._scan_thread.join(timeout=2.0)
+        if self._scan_thread.is_alive():
+            self.log_warning("Background scan still waiting for the radio, it exits once released")
+            return
+        self._scan_thread = None
+
+    def _scan_worker(self):
+        """Периодически снимает спектр, пока модуль загружен"""
+        while not self._scan_stop.wait(self.scan_interval):
+            with self._radio_lock:
+                if self._scan_stop.is_set():
+                    break
+                try:
+                    spectrum = self.scanner.scan_spectrum()
+                except Exception as e:
+                    self.log_error(f"Background scan failed: {e}")
+                    continue
+            self._snapshots.append(spectrum)
+
+    def _latest_spectrum(self) -> bytearray:
+        """Последний снимок фонового сканера, иначе синхронный скан"""
+        if self._snapshots:
+            return self._snapshots[-1]
+
+        with self._radio_lock:
+            return self.scanner.scan_spectrum()
+
     def quick_scan(self):
         """Быстрое сканирование спектра"""
         self.log_info("Starting quick scan")
@@ -114,21 +215,19 @@ class NRF24Module(BaseModule):
             "Please wait..."
         )
 
-        # Perform scan
-        spectrum = self.scanner.scan_spectrum()
+        # Latest background snapshot (scans synchronously if none yet)
+        spectrum = self._latest_spectrum()
         self.scan_history.append(spectrum)
 
-        # Keep only recent scans
-        if len(self.scan_history) > self.max_history:
-            self.scan_history.pop(0)
-
         # Analyze results
-        active_channels = [i for i, v in enumerate(spectrum) if v > 0]
-        total_activity = sum(spectrum)
+        activity = np.frombuffer(spectrum, dtype=np.uint8).astype(np.int32)
+        active_channels = np.flatnonzero(activity).tolist()
+        total_activity = int(activity.sum())
 
         # Identify bands
-        wifi_channels = self._identify_wifi_channels(active_channels)
-        bluetooth_active = any(ch in range(2, 81) for ch in active_channels)
+        active_mask = int.from_bytes(bytes(spectrum), 'little')
+        wifi_channels = self._identify_wifi_channels(active_mask)
+        bluetooth_active = bool(active_mask & _BLUETOOTH_MASK)
 
         result_text = f"Spectrum Scan Complete\n\n"
         result_text += f"Active channels: {len(active_channels)}/126\n"
@@ -142,12 +241,14 @@ class NRF24Module(BaseModule):
 
         if active_channels:
             result_text += f"\nMost active frequencies:\n"
-            # Get top 5 active channels
-            sorted_channels = sorted(enumerate(spectrum), key=lambda x: x[1], reverse=True)
-            for i, (ch, activity) in enumerate(sorted_channels[:5]):
-                if activity > 0:
+            # Get top 5 active channels (partial sort, highest first;
+            # ties go to the lower channel, as with a stable sort)
+            rank = activity * len(activity) - np.arange(len(activity))
+            top = np.argpartition(rank, -5)[-5:]
+            for ch in top[np.argsort(-rank[top])]:
+                if activity[ch] > 0:
                     freq = 2400 + ch
-                    result_text += f"  {freq} MHz: {activity}\n"
+                    result_text += f"  {freq} MHz: {activity[ch]}\n"
 
         self.show_message("Scan Results", result_text)
         self.log_info(f"Scan complete: {len(active_channels)} active channels")
@@ -161,28 +262,28 @@ class NRF24Module(BaseModule):
             "This will take about 10 seconds."
         )
 
-        # Multiple scans for averaging
-        num_scans = 10
-        accumulated = [0] * self.scanner.num_channels
-
-        for i in range(num_scans):
-            spectrum = self.scanner.scan_spectrum()
-            for j in range(len(spectrum)):
-                accumulated[j] += spectrum[j]
+        # Multiple scans for averaging: reuse background snapshots if the
+        # worker already has enough, otherwise scan here
+        num_scans = ANALYZER_SCANS
+        scans = np.empty((num_scans, self.scanner.num_channels), dtype=np.uint8)
+        snapshots = list(self._snapshots)
 
-            # Update progress
-            if i % 2 == 0:
-                progress = int((i + 1) / num_scans * 100)
-                # Could update UI here if we had a progress bar
+        if len(snapshots) == num_scans:
+            for i, spectrum in enumerate(snapshots):
+                scans[i] = spectrum
+        else:
+            with self._radio_lock:
+                for i in range(num_scans):
+                    scans[i] = self.scanner.scan_spectrum()
 
-        # Find hotspots
-        max_activity = max(accumulated)
-        hotspots = []
+                    # Update progress
+                    if i % 2 == 0:
+                        progress = int((i + 1) / num_scans * 100)
+                        # Could update UI here if we had a progress bar
 
-        for i, activity in enumerate(accumulated):
-            if activity > max_activity * 0.5:  # 50% threshold
-                freq = 2400 + i
-                hotspots.append((freq, activity))
+        # Find hotspots (>50% of max activity)
+        accumulated, max_activity, hot = _fold_spectrum(scans, 0.5)
+        hotspots = list(zip((2400 + hot).tolist(), accumulated[hot].tolist()))
 
         result_text = f"Spectrum Analysis ({num_scans} scans)\n\n"
 
@@ -199,23 +300,14 @@ class NRF24Module(BaseModule):
 
         self.show_message("Spectrum Analysis", result_text)
 
-    def _identify_wifi_channels(self, active_channels: List[int]) -> List[int]:
-        """Определение WiFi каналов из активных частот"""
-        wifi_channels = []
-
-        # WiFi канал 1: 2412 МГц (nRF24 каналы 7-17)
-        if any(ch in range(7, 18) for ch in active_channels):
-            wifi_channels.append(1)
-
-        # WiFi канал 6: 2437 МГц (nRF24 каналы 32-42)
-        if any(ch in range(32, 43) for ch in active_channels):
-            wifi_channels.append(6)
+    def _identify_wifi_channels(self, active_mask: int) -> List[int]:
+        """
+        Определение WiFi каналов из активных частот
 
-        # WiFi канал 11: 2462 МГц (nRF24 каналы 57-67)
-        if any(ch in range(57, 68) for ch in active_channels):
-            wifi_channels.append(11)
-
-        return wifi_channels
+        Args:
+            active_mask: Спектр как int.from_bytes(spectrum, 'little')
+        """
+        return [wifi_ch for wifi_ch, mask in _WIFI_MASKS if active_mask & mask]
 
     # ========== Jamming Functions ==========
 
@@ -273,13 +365,14 @@ class NRF24Module(BaseModule):
 
             # Run jamming in background (limited duration for safety)
             try:
-                stats = self.scanner.jam_spectrum(
-                    channels=list(range(2, 81)),
-                    hop_delay=0.0005,
-                    mode='continuous',
-                    ble_priority=True,
-                    callback=lambda: time.time() > time.time() + 30  # 30 sec limit
-                )
+                with self._radio_lock:
+                    stats = self.scanner.jam_spectrum(
+                        channels=list(range(2, 81)),
+                        hop_delay=0.0005,
+                        mode='continuous',
+                        ble_priority=True,
+                        callback=self._stop_after(JAM_TIME_LIMIT)
+                    )
 
                 self.show_message(
                     "Jamming Complete",
@@ -327,13 +420,14 @@ class NRF24Module(BaseModule):
             )
 
             try:
-                stats = self.scanner.jam_spectrum(
-                    channels=wifi_channels,
-                    hop_delay=0,
-                    mode='continuous',
-                    ble_priority=False,
-                    callback=lambda: time.time() > time.time() + 30
-                )
+                with self._radio_lock:
+                    stats = self.scanner.jam_spectrum(
+                        channels=wifi_channels,
+                        hop_delay=0,
+                        mode='continuous',
+                        ble_priority=False,
+                        callback=self._stop_after(JAM_TIME_LIMIT)
+                    )
 
                 self.show_message(
                     "Jamming Complete",
@@ -360,13 +454,14 @@ class NRF24Module(BaseModule):
         )
 
         try:
-            stats = self.scanner.jam_spectrum(
-                channels=ble_channels,
-                hop_delay=0,
-                mode='continuous',
-                ble_priority=True,
-                callback=lambda: time.time() > time.time() + 30
-            )
+            with self._radio_lock:
+                stats = self.scanner.jam_spectrum(
+                    channels=ble_channels,
+                    hop_delay=0,
+                    mode='continuous',
+                    ble_priority=True,
+                    callback=self._stop_after(JAM_TIME_LIMIT)
+                )
 
             self.show_message(
                 "Jamming Complete",
@@ -410,13 +505,14 @@ class NRF24Module(BaseModule):
                 self.jamming_active = True
 
                 try:
-                    stats = self.scanner.jam_spectrum(
-                        channels=channels,
-                        hop_delay=0,
-                        mode='continuous',
-                        ble_priority=False,
-                        callback=lambda: time.time() > time.time() + 30
-                    )
+                    with self._radio_lock:
+                        stats = self.scanner.jam_spectrum(
+                            channels=channels,
+                            hop_delay=0,
+                            mode='continuous',
+                            ble_priority=False,
+                            callback=self._stop_after(JAM_TIME_LIMIT)
+                        )
 
                     self.show_message(
                         "Jamming Complete",
@@ -431,6 +527,11 @@ class NRF24Module(BaseModule):
         except ValueError:
             self.show_error("Invalid channel format")
 
+    def _stop_after(self, seconds: float) -> Callable[[], bool]:
+        """Callback для jam_spectrum: True по истечении seconds с момента вызова"""
+        deadline = time.monotonic() + seconds
+        return lambda: time.monotonic() > deadline
+
     def stop_jamming(self):
         """Остановка джамминга"""
         self.jamming_active = False
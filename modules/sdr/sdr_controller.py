@@ -2,11 +2,50 @@
 SDR Controller - управление HackRF One и RTL-SDR
 """
 
+import asyncio
 import subprocess
 import os
+import re
+import threading
+import time
 import logging
-from typing import Optional, Dict, List
-from datetime import datetime
+from typing import Optional, Dict, List, Tuple
+
+import numpy as np
+
+
+# USB (idVendor, idProduct) pairs of supported SDR boards
+SDR_USB_IDS = {
+    'hackrf': {('1d50', '6089'), ('1d50', '604b'), ('1d50', 'cc15')},  # One, Jawbreaker, rad1o
+    'rtlsdr': {('0bda', '2832'), ('0bda', '2838')},  # RTL2832U dongles
+}
+
+USB_SYSFS_PATH = "/sys/bus/usb/devices"
+
+HZ_PER_MHZ = 1_000_000
+
+
+def _mhz_to_hz(mhz: float) -> int:
+    """MHz to integer Hz, rounded (int() would turn 2.01 MHz into 2009999 Hz)"""
+    return round(mhz * HZ_PER_MHZ)
+
+# hackrf_info: "Serial number: ...", "Board ID Number: ...", "Firmware Version: ..."
+_HACKRF_INFO_RE = re.compile(
+    r'^[^\n]*?(Serial number|Board ID|Firmware Version)[^:\n]*:[^\S\n]*(.*?)\s*$',
+    re.M
+)
+_HACKRF_FIELDS = {
+    'Serial number': 'serial',
+    'Board ID': 'board_id',
+    'Firmware Version': 'firmware',
+}
+
+# rtl_test: "Found N device(s):" / "Found <tuner> tuner" lines and "Tuner ...: <name>"
+_RTLSDR_INFO_RE = re.compile(
+    r'^[^\S\n]*(?P<device>[^\n]*Found[^\n]*?)\s*$'
+    r'|^[^:\n]*Tuner[^:\n]*:[^\S\n]*(?P<tuner>[^:\n]*?)\s*$',
+    re.M
+)
 
 
 class SDRController:
@@ -28,87 +67,213 @@ class SDRController:
         self.active_device = None
         self.device_info = {}
 
+        # detect_devices() result cache (probes spawn external tools)
+        self._detect_cache = None
+        self._detect_cache_ts = 0.0
+        self._detect_ttl = 2.0
+
+        # Long-running rtl_power feeding _spectrum_rtlsdr()
+        # (a reader thread keeps draining its pipe so sweeps are never stale)
+        self._rtl_power_proc = None
+        self._rtl_power_band = None
+        self._rtl_power_reader = None
+        self._rtl_power_latest = None
+        self._rtl_power_done = False
+        self._rtl_power_cond = threading.Condition()
+
     def detect_devices(self) -> Dict[str, bool]:
         """
         Detect available SDR devices.
 
+        Devices are matched by USB id in sysfs, the vendor tools are only
+        used when sysfs is missing. Results are cached for a short time.
+
         Returns:
             Dict of device availability
         """
-        available = {}
-
-        # Check HackRF
-        available['hackrf'] = self._check_hackrf()
+        if self._detect_cache_valid():
+            return dict(self._detect_cache)
+
+        return asyncio.run(self.detect_devices_async())
+
+    async def detect_devices_async(self) -> Dict[str, bool]:
+        """Async variant of detect_devices() for callers running an event loop"""
+        if self._detect_cache_valid():
+            return dict(self._detect_cache)
+
+        usb_ids = self._scan_usb_ids()
+        if usb_ids is not None:
+            # Plain sysfs lookup, no tools spawned
+            available = {
+                dev: not ids.isdisjoint(usb_ids)
+                for dev, ids in SDR_USB_IDS.items()
+            }
+        else:
+            # No sysfs - both probes only wait on USB enumeration, so run them concurrently
+            available = await self._detect_async()
 
-        # Check RTL-SDR
-        available['rtlsdr'] = self._check_rtlsdr()
+        self._detect_cache = available
+        self._detect_cache_ts = time.monotonic()
 
         self.logger.info(f"SDR devices detected: {available}")
-        return available
+        return dict(available)
 
-    def _check_hackrf(self) -> bool:
-        """Check if HackRF is available"""
+    def _detect_cache_valid(self) -> bool:
+        """Check whether the cached detect_devices() result is still fresh"""
+        return (self._detect_cache is not None
+                and time.monotonic() - self._detect_cache_ts < self._detect_ttl)
+
+    def invalidate_detect_cache(self):
+        """Force the next detect_devices() call to probe again"""
+        self._detect_cache = None
+
+    def get_device_info(self, device: str) -> Dict:
+        """
+        Get device details (serial, firmware, tuner).
+
+        Runs the vendor tool on demand, detect_devices() doesn't.
+
+        Args:
+            device: hackrf or rtlsdr
+
+        Returns:
+            Dict of device info (empty if unavailable)
+        """
+        checks = {
+            'hackrf': self._check_hackrf,
+            'rtlsdr': self._check_rtlsdr,
+        }
+        if device not in checks:
+            return {}
+
+        if asyncio.run(checks[device]()):
+            return dict(self.device_info.get(device, {}))
+        return {}
+
+    def _scan_usb_ids(self) -> Optional[set]:
+        """
+        Collect (idVendor, idProduct) of all attached USB devices from sysfs.
+
+        Returns:
+            Set of id pairs or None if sysfs is not available
+        """
         try:
-            result = subprocess.run(
-                ["hackrf_info"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
+            entries = list(os.scandir(USB_SYSFS_PATH))
+        except OSError:
+            return None
 
-            if result.returncode == 0 and "Found HackRF" in result.stdout:
-                # Parse device info
-                self.device_info['hackrf'] = self._parse_hackrf_info(result.stdout)
-                return True
+        ids = set()
+        for entry in entries:
+            try:
+                with open(os.path.join(entry.path, "idVendor")) as f:
+                    vid = f.read().strip()
+                with open(os.path.join(entry.path, "idProduct")) as f:
+                    pid = f.read().strip()
+            except OSError:
+                # Interfaces and hubs without ids
+                continue
+            ids.add((vid, pid))
+
+        return ids
+
+    async def _detect_async(self) -> Dict[str, bool]:
+        """Run all device probes concurrently"""
+        hackrf, rtlsdr = await asyncio.gather(
+            self._check_hackrf(),
+            self._check_rtlsdr(),
+            return_exceptions=True
+        )
 
-            return False
+        # A probe that raised counts as "not available"
+        return {
+            'hackrf': hackrf is True,
+            'rtlsdr': rtlsdr is True,
+        }
 
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            return False
+    async def _run(self, cmd: List[str], timeout: float = 5) -> Optional[Tuple[int, str, str]]:
+        """
+        Run an external tool without blocking the event loop.
 
-    def _check_rtlsdr(self) -> bool:
-        """Check if RTL-SDR is available"""
+        The tool is killed on timeout and when the awaiting task is cancelled.
+
+        Args:
+            cmd: Command line
+            timeout: Timeout in seconds
+
+        Returns:
+            (returncode, stdout, stderr) or None if the tool is missing or timed out
+        """
         try:
-            result = subprocess.run(
-                ["rtl_test", "-t"],
-                capture_output=True,
-                text=True,
-                timeout=5
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
             )
+        except FileNotFoundError:
+            return None
 
-            if "Found" in result.stdout:
-                # Parse device info
-                self.device_info['rtlsdr'] = self._parse_rtlsdr_info(result.stdout)
-                return True
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return None
+        except asyncio.CancelledError:
+            # Caller gave up (e.g. UI cancel) - don't leave the tool running
+            proc.kill()
+            await proc.wait()
+            raise
 
+        return (proc.returncode,
+                stdout.decode(errors='replace'),
+                stderr.decode(errors='replace'))
+
+    async def _check_hackrf(self) -> bool:
+        """Check if HackRF is available"""
+        result = await self._run(["hackrf_info"])
+        if result is None:
             return False
 
-        except (subprocess.TimeoutExpired, FileNotFoundError):
+        returncode, stdout, _ = result
+        if returncode == 0 and "Found HackRF" in stdout:
+            # Parse device info
+            self.device_info['hackrf'] = self._parse_hackrf_info(stdout)
+            return True
+
+        return False
+
+    async def _check_rtlsdr(self) -> bool:
+        """Check if RTL-SDR is available"""
+        # rtl_power would hold the dongle and rtl_test would report it busy
+        self.close()
+        result = await self._run(["rtl_test", "-t"])
+        if result is None:
             return False
 
-    def _parse_hackrf_info(self, output: str) -> Dict:
-        """Parse HackRF device info"""
-        info = {}
+        _, stdout, _ = result
+        if "Found" in stdout:
+            # Parse device info
+            self.device_info['rtlsdr'] = self._parse_rtlsdr_info(stdout)
+            return True
 
-        for line in output.split('\n'):
-            if "Serial number" in line:
-                info['serial'] = line.split(':')[1].strip()
-            elif "Board ID" in line:
-                info['board_id'] = line.split(':')[1].strip()
-            elif "Firmware Version" in line:
-                info['firmware'] = line.split(':')[1].strip()
+        return False
 
-        return info
+    def _parse_hackrf_info(self, output: str) -> Dict:
+        """Parse HackRF device info"""
+        return {
+            _HACKRF_FIELDS[m.group(1)]: m.group(2)
+            for m in _HACKRF_INFO_RE.finditer(output)
+        }
 
     def _parse_rtlsdr_info(self, output: str) -> Dict:
         """Parse RTL-SDR device info"""
         info = {}
 
-        for line in output.split('\n'):
-            if "Found" in line:
-                info['device'] = line.strip()
-            elif "Tuner" in line:
-                info['tuner'] = line.split(':')[1].strip()
+        for m in _RTLSDR_INFO_RE.finditer(output):
+            if m.group('device') is not None:
+                info['device'] = m.group('device')
+            else:
+                info['tuner'] = m.group('tuner')
 
         return info
 
@@ -127,9 +292,16 @@ class SDRController:
         Returns:
             bool: True if successful
         """
+        return asyncio.run(
+            self.record_iq_async(frequency, sample_rate, duration, output_file, device)
+        )
+
+    async def record_iq_async(self, frequency: float, sample_rate: float, duration: int,
+                              output_file: str, device: str = None) -> bool:
+        """Async variant of record_iq() for callers running an event loop"""
         if device is None:
             # Auto-select device
-            available = self.detect_devices()
+            available = await self.detect_devices_async()
             for dev in self.device_priority:
                 if available.get(dev):
                     device = dev
@@ -143,25 +315,30 @@ class SDRController:
 
         try:
             if device == "hackrf":
-                return self._record_hackrf(frequency, sample_rate, duration, output_file)
+                ok = await self._record_hackrf(frequency, sample_rate, duration, output_file)
             elif device == "rtlsdr":
-                return self._record_rtlsdr(frequency, sample_rate, duration, output_file)
+                ok = await self._record_rtlsdr(frequency, sample_rate, duration, output_file)
             else:
                 self.logger.error(f"Unknown device: {device}")
                 return False
 
         except Exception as e:
             self.logger.error(f"IQ recording failed: {e}")
-            return False
+            ok = False
 
-    def _record_hackrf(self, frequency: float, sample_rate: float, duration: int,
+        # Device may have been unplugged - re-probe next time
+        if not ok:
+            self.invalidate_detect_cache()
+        return ok
+
+    async def _record_hackrf(self, frequency: float, sample_rate: float, duration: int,
                       output_file: str) -> bool:
         """Record IQ with HackRF"""
         # Convert frequency to Hz
-        freq_hz = int(frequency * 1e6)
+        freq_hz = _mhz_to_hz(frequency)
 
         # Convert sample rate to Hz
-        sample_rate_hz = int(sample_rate * 1e6)
+        sample_rate_hz = _mhz_to_hz(sample_rate)
 
         # Calculate number of samples
         num_samples = int(sample_rate_hz * duration)
@@ -174,28 +351,30 @@ class SDRController:
             "-n", str(num_samples)
         ]
 
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=duration + 10
-        )
+        result = await self._run(cmd, timeout=duration + 10)
+        if result is None:
+            self.logger.error("HackRF recording failed: hackrf_transfer missing or timed out")
+            return False
 
-        if result.returncode == 0:
+        returncode, _, stderr = result
+        if returncode == 0:
             self.logger.info(f"HackRF recording saved: {output_file}")
             return True
         else:
-            self.logger.error(f"HackRF recording failed: {result.stderr}")
+            self.logger.error(f"HackRF recording failed: {stderr}")
             return False
 
-    def _record_rtlsdr(self, frequency: float, sample_rate: float, duration: int,
+    async def _record_rtlsdr(self, frequency: float, sample_rate: float, duration: int,
                       output_file: str) -> bool:
         """Record IQ with RTL-SDR"""
+        # Release the dongle if the spectrum analyzer still holds it
+        self.close()
+
         # Convert frequency to Hz
-        freq_hz = int(frequency * 1e6)
+        freq_hz = _mhz_to_hz(frequency)
 
         # Convert sample rate to Hz
-        sample_rate_hz = int(sample_rate * 1e6)
+        sample_rate_hz = _mhz_to_hz(sample_rate)
 
         # Calculate number of samples
         num_samples = int(sample_rate_hz * duration * 2)  # I+Q samples
@@ -208,18 +387,17 @@ class SDRController:
             output_file
         ]
 
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=duration + 10
-        )
+        result = await self._run(cmd, timeout=duration + 10)
+        if result is None:
+            self.logger.error("RTL-SDR recording failed: rtl_sdr missing or timed out")
+            return False
 
-        if result.returncode == 0:
+        returncode, _, stderr = result
+        if returncode == 0:
             self.logger.info(f"RTL-SDR recording saved: {output_file}")
             return True
         else:
-            self.logger.error(f"RTL-SDR recording failed: {result.stderr}")
+            self.logger.error(f"RTL-SDR recording failed: {stderr}")
             return False
 
     def spectrum_analyzer(self, start_freq: float, stop_freq: float,
@@ -258,52 +436,143 @@ class SDRController:
         """Spectrum analysis with RTL-SDR using rtl_power"""
         try:
             # Convert to Hz
-            start_hz = int(start_freq * 1e6)
-            stop_hz = int(stop_freq * 1e6)
-            bin_hz = int(bin_size * 1e6)
+            start_hz = _mhz_to_hz(start_freq)
+            stop_hz = _mhz_to_hz(stop_freq)
+            bin_hz = _mhz_to_hz(bin_size)
 
-            # Output file
-            output_file = "/tmp/rtl_power_output.csv"
+            sweep = self._rtl_power_sweep((start_hz, stop_hz, bin_hz))
+            if not sweep:
+                return None
 
-            cmd = [
-                "rtl_power",
-                "-f", f"{start_hz}:{stop_hz}:{bin_hz}",
-                "-i", "1",  # 1 second integration
-                output_file
-            ]
+            # Row (one per hop): date, time, Hz low, Hz high, Hz step, samples, dB, dB, ...
+            # Each dB column is already one bin_size-wide bin, so report every bin
+            spectrum = []
+            for parts in sweep:
+                freq_low = float(parts[2])
+                freq_step = float(parts[4])
+                # Power bins are parsed in one pass by numpy
+                powers = np.fromstring(parts[6], sep=',')
+                freqs = (freq_low + freq_step * np.arange(powers.size)) / 1e6
 
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                timeout=10
-            )
+                spectrum.extend(zip(freqs.tolist(), powers.tolist()))
 
-            if result.returncode == 0 and os.path.exists(output_file):
-                # Parse output
-                spectrum = []
-                with open(output_file, 'r') as f:
-                    for line in f:
-                        parts = line.strip().split(',')
-                        if len(parts) > 6:
-                            # Extract frequency and power data
-                            freq_low = float(parts[2])
-                            freq_high = float(parts[3])
-                            freq_center = (freq_low + freq_high) / 2
-                            # Power values start from index 6
-                            powers = [float(p) for p in parts[6:]]
-                            avg_power = sum(powers) / len(powers) if powers else 0
-
-                            spectrum.append((freq_center / 1e6, avg_power))
-
-                os.remove(output_file)
-                return spectrum
-
-            return None
+            return spectrum
 
         except Exception as e:
             self.logger.error(f"Spectrum analysis failed: {e}")
             return None
 
+    def _rtl_power_sweep(self, band: Tuple[int, int, int],
+                         timeout: float = 10) -> Optional[List[List[str]]]:
+        """
+        Get the next complete sweep from a long-running rtl_power.
+
+        rtl_power keeps streaming CSV to a pipe, so the tuner is only
+        initialized once per band. A reader thread drains the pipe and keeps
+        only the newest sweep, each sweep is handed out once.
+
+        Args:
+            band: (start_hz, stop_hz, bin_hz)
+            timeout: Seconds to wait for a complete sweep
+
+        Returns:
+            Split CSV rows of the newest sweep, or None
+        """
+        proc = self._rtl_power_proc
+        if proc is None or proc.poll() is not None or self._rtl_power_band != band:
+            self.close()
+            start_hz, stop_hz, bin_hz = band
+            proc = subprocess.Popen(
+                [
+                    "rtl_power",
+                    "-f", f"{start_hz}:{stop_hz}:{bin_hz}",
+                    "-i", "1",  # 1 second integration
+                    "-"
+                ],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL
+            )
+            reader = threading.Thread(target=self._rtl_power_read, args=(proc,), daemon=True)
+            with self._rtl_power_cond:
+                self._rtl_power_proc = proc
+                self._rtl_power_band = band
+                self._rtl_power_reader = reader
+            reader.start()
+
+        with self._rtl_power_cond:
+            self._rtl_power_cond.wait_for(
+                lambda: self._rtl_power_latest is not None or self._rtl_power_done,
+                timeout
+            )
+            sweep = self._rtl_power_latest
+            self._rtl_power_latest = None
+            done = self._rtl_power_done
+
+        if sweep is None:
+            if done:
+                # rtl_power exited (device gone or busy)
+                self.close()
+            else:
+                self.logger.warning("rtl_power produced no sweep in time")
+        return sweep
+
+    def _rtl_power_read(self, proc: subprocess.Popen):
+        """
+        Reader thread: split rtl_power output into sweeps.
+
+        All hops of one sweep share the same timestamp, so a sweep is
+        complete when the timestamp changes.
+
+        Args:
+            proc: rtl_power process to read from
+        """
+        rows = []
+        try:
+            for line in proc.stdout:
+                parts = line.decode('ascii', 'replace').split(',', 6)
+                if len(parts) <= 6:
+                    continue
+                if rows and rows[0][:2] != parts[:2]:
+                    with self._rtl_power_cond:
+                        # Drop sweeps of a process close() already replaced
+                        if self._rtl_power_proc is proc:
+                            self._rtl_power_latest = rows
+                            self._rtl_power_cond.notify_all()
+                    rows = []
+                rows.append(parts)
+        except (OSError, ValueError):
+            # Pipe closed by close()
+            pass
+
+        with self._rtl_power_cond:
+            if self._rtl_power_proc is proc:
+                self._rtl_power_done = True
+                self._rtl_power_cond.notify_all()
+
+    def close(self):
+        """Stop the background rtl_power process, if any"""
+        with self._rtl_power_cond:
+            proc = self._rtl_power_proc
+            reader = self._rtl_power_reader
+            self._rtl_power_proc = None
+            self._rtl_power_band = None
+            self._rtl_power_reader = None
+            self._rtl_power_latest = None
+            self._rtl_power_done = False
+
+        if proc is not None and proc.poll() is None:
+            proc.terminate()
+            try:
+                proc.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+        if reader is not None:
+            # The process is gone, so the reader sees EOF
+            reader.join(timeout=2)
+        if proc is not None:
+            proc.stdout.close()
+
     def transmit(self, frequency: float, sample_rate: float, input_file: str,
                 device: str = "hackrf") -> bool:
         """
@@ -318,13 +587,18 @@ class SDRController:
         Returns:
             bool: True if successful
         """
+        return asyncio.run(self.transmit_async(frequency, sample_rate, input_file, device))
+
+    async def transmit_async(self, frequency: float, sample_rate: float, input_file: str,
+                             device: str = "hackrf") -> bool:
+        """Async variant of transmit() for callers running an event loop"""
         if device != "hackrf":
             self.logger.error("Only HackRF supports transmission")
             return False
 
         try:
-            freq_hz = int(frequency * 1e6)
-            sample_rate_hz = int(sample_rate * 1e6)
+            freq_hz = _mhz_to_hz(frequency)
+            sample_rate_hz = _mhz_to_hz(sample_rate)
 
             cmd = [
                 "hackrf_transfer",
@@ -334,18 +608,17 @@ class SDRController:
                 "-x", "47"  # TX gain
             ]
 
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
+            result = await self._run(cmd, timeout=60)
+            if result is None:
+                self.logger.error("HackRF transmission failed: hackrf_transfer missing or timed out")
+                return False
 
-            if result.returncode == 0:
+            returncode, _, stderr = result
+            if returncode == 0:
                 self.logger.info("HackRF transmission complete")
                 return True
             else:
-                self.logger.error(f"HackRF transmission failed: {result.stderr}")
+                self.logger.error(f"HackRF transmission failed: {stderr}")
                 return False
 
         except Exception as e:
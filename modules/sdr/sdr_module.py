@@ -11,7 +11,7 @@ import numpy as np
 
 try:
     import SoapySDR
-    from SoapySDR import SOAPY_SDR_RX, SOAPY_SDR_CF32
+    from SoapySDR import SOAPY_SDR_RX, SOAPY_SDR_CF32, SOAPY_SDR_CS8
     SOAPY_AVAILABLE = True
 except ImportError:
     SOAPY_AVAILABLE = False
@@ -45,8 +45,14 @@ class SDRModule(BaseModule):
         self.sample_rate = 2.048e6  # 2.048 MHz
         self.gain = 20
         
+        # Settings already programmed into the radio, and the reusable RX stream
+        self._applied = {'rate': None, 'freq': None, 'gain': None}
+        self._rx_stream = None
+        self._rx_format = None
+        
+        # Created on first recording, not at module discovery
         self.samples_dir = "iq_samples"
-        os.makedirs(self.samples_dir, exist_ok=True)
+        self._samples_dir_ready = False
     
     def on_load(self):
         """Инициализация модуля"""
@@ -74,6 +80,7 @@ class SDRModule(BaseModule):
             # Try to open first device
             device_args = devices[0]
             self.sdr = SoapySDR.Device(device_args)
+            self._reset_device_state()
             
             # Detect device type
             if 'hackrf' in str(device_args).lower():
@@ -93,9 +100,11 @@ class SDRModule(BaseModule):
         """Освобождение ресурсов"""
         if self.sdr:
             try:
+                self._close_stream()
                 self.sdr = None
             except Exception as e:
                 self.log_error(f"Error closing SDR: {e}")
+            self._reset_device_state()
     
     def get_menu_items(self) -> List[Tuple[str, Callable]]:
         """Пункты меню модуля"""
@@ -132,24 +141,22 @@ class SDRModule(BaseModule):
             
         try:
             # Configure RX
-            self.sdr.setSampleRate(SOAPY_SDR_RX, 0, self.sample_rate)
-            self.sdr.setFrequency(SOAPY_SDR_RX, 0, self.center_freq)
-            self.sdr.setGain(SOAPY_SDR_RX, 0, self.gain)
+            self._apply_params()
             
             # Create stream
-            rxStream = self.sdr.setupStream(SOAPY_SDR_RX, SOAPY_SDR_CF32)
+            rxStream = self._ensure_stream(SOAPY_SDR_CF32)
             self.sdr.activateStream(rxStream)
             
             # Receive samples
-            buff = np.array([0]*1024, np.complex64)
+            buff = np.zeros(1024, np.complex64)
             sr = self.sdr.readStream(rxStream, [buff], len(buff))
             
             if sr.ret > 0:
                 # Compute FFT
-                fft = np.fft.fft(buff)
-                fft_shifted = np.fft.fftshift(fft)
-                magnitude = np.abs(fft_shifted)
-                magnitude_db = 20 * np.log10(magnitude + 1e-10)
+                # 10*log10(|X|^2) == 20*log10(|X|), without a sqrt per bin
+                fft_shifted = np.fft.fftshift(np.fft.fft(buff))
+                power = fft_shifted.real ** 2 + fft_shifted.imag ** 2
+                magnitude_db = 10 * np.log10(power + 1e-20)
                 
                 # Find peak
                 peak_idx = np.argmax(magnitude_db)
@@ -162,21 +169,74 @@ class SDRModule(BaseModule):
                 spectrum_text += f"Gain: {self.gain}dB\n\n"
                 spectrum_text += f"Peak: {peak_db:.1f}dBFS\n\n"
                 
-                # Simple bar chart
-                for i in range(0, len(magnitude_db), 20):
-                    level = int(magnitude_db[i] + 100)  # Scale to 0-100
-                    bars = '█' * max(0, min(level, 50))
-                    spectrum_text += f"{bars}\n"
+                # Simple bar chart, every 20th bin scaled to 0-100 and capped at 50
+                levels = np.clip((magnitude_db[::20] + 100).astype(np.int32), 0, 50)
+                spectrum_text += ''.join('█' * level + '\n' for level in levels.tolist())
                 
                 self.show_message("Spectrum Analyzer", spectrum_text)
             
-            # Cleanup
+            # Cleanup (stream itself stays set up for the next call)
             self.sdr.deactivateStream(rxStream)
-            self.sdr.closeStream(rxStream)
             
         except Exception as e:
+            self._close_stream()
             self.show_error(f"Spectrum analyzer error: {e}")
     
+    def _ensure_samples_dir(self) -> str:
+        """Create the recordings directory once, return its path"""
+        if not self._samples_dir_ready:
+            os.makedirs(self.samples_dir, exist_ok=True)
+            self._samples_dir_ready = True
+        return self.samples_dir
+    
+    def _apply_params(self):
+        """Push sample rate, frequency and gain to the radio, skipping unchanged ones"""
+        applied = self._applied
+        
+        if applied['rate'] != self.sample_rate:
+            self.sdr.setSampleRate(SOAPY_SDR_RX, 0, self.sample_rate)
+            applied['rate'] = self.sample_rate
+        if applied['freq'] != self.center_freq:
+            self.sdr.setFrequency(SOAPY_SDR_RX, 0, self.center_freq)
+            applied['freq'] = self.center_freq
+        if applied['gain'] != self.gain:
+            self.sdr.setGain(SOAPY_SDR_RX, 0, self.gain)
+            applied['gain'] = self.gain
+    
+    def _ensure_stream(self, sample_format):
+        """
+        Get the RX stream for a sample format.
+        
+        The stream is set up once and reused; it is only rebuilt when a
+        different format is requested.
+        """
+        if self._rx_stream is not None and self._rx_format != sample_format:
+            self._close_stream()
+            
+        if self._rx_stream is None:
+            self._rx_stream = self.sdr.setupStream(SOAPY_SDR_RX, sample_format)
+            self._rx_format = sample_format
+            
+        return self._rx_stream
+    
+    def _close_stream(self):
+        """Close the cached RX stream, if any"""
+        stream = self._rx_stream
+        self._rx_stream = None
+        self._rx_format = None
+        
+        if stream is not None:
+            try:
+                self.sdr.closeStream(stream)
+            except Exception as e:
+                self.log_error(f"Error closing RX stream: {e}")
+    
+    def _reset_device_state(self):
+        """Forget the applied settings and RX stream, they belong to the old device"""
+        self._applied = {'rate': None, 'freq': None, 'gain': None}
+        self._rx_stream = None
+        self._rx_format = None
+    
     def demo_spectrum_analyzer(self):
         """Demo spectrum analyzer"""
         self.show_message(
@@ -211,47 +271,51 @@ class SDRModule(BaseModule):
             
         try:
             # Configure
-            self.sdr.setSampleRate(SOAPY_SDR_RX, 0, self.sample_rate)
-            self.sdr.setFrequency(SOAPY_SDR_RX, 0, self.center_freq)
-            self.sdr.setGain(SOAPY_SDR_RX, 0, self.gain)
+            self._apply_params()
             
-            # Create stream
-            rxStream = self.sdr.setupStream(SOAPY_SDR_RX, SOAPY_SDR_CF32)
+            # Create stream (native 8-bit IQ, a quarter of the CF32 size on disk)
+            rxStream = self._ensure_stream(SOAPY_SDR_CS8)
             self.sdr.activateStream(rxStream)
             
+            # Output file is memory-mapped, samples go straight to disk
+            filename = f"iq_{int(self.center_freq/1e6)}MHz_{int(time.time())}.npy"
+            filepath = os.path.join(self._ensure_samples_dir(), filename)
+            
             # Record
             samples_to_read = int(self.sample_rate * duration)
-            all_samples = []
+            samples = np.lib.format.open_memmap(
+                filepath, mode='w+', dtype=np.int8, shape=(samples_to_read, 2)
+            )
+            written = 0
             
             self.show_message("Recording", f"Recording {duration}s...\nPlease wait.")
             
-            while len(all_samples) < samples_to_read:
-                buff = np.array([0]*4096, np.complex64)
-                sr = self.sdr.readStream(rxStream, [buff], len(buff))
+            while written < samples_to_read:
+                # Stream straight into the tail of the capture file
+                chunk = samples[written:written + 4096]
+                sr = self.sdr.readStream(rxStream, [chunk], len(chunk))
                 
                 if sr.ret > 0:
-                    all_samples.extend(buff[:sr.ret])
-            
-            # Save to file
-            filename = f"iq_{int(self.center_freq/1e6)}MHz_{int(time.time())}.npy"
-            filepath = os.path.join(self.samples_dir, filename)
+                    written += sr.ret
             
-            np.save(filepath, np.array(all_samples))
+            samples.flush()
+            del samples
             
-            # Cleanup
+            # Cleanup (stream itself stays set up for the next call)
             self.sdr.deactivateStream(rxStream)
-            self.sdr.closeStream(rxStream)
             
             self.show_message(
                 "Recording Complete",
                 f"IQ samples saved!\n\n"
                 f"File: {filename}\n"
-                f"Samples: {len(all_samples)}\n"
+                f"Samples: {written}\n"
+                f"Format: CS8 (int8 I/Q pairs)\n"
                 f"Duration: {duration}s\n"
                 f"Center Freq: {self.center_freq/1e6:.2f}MHz"
             )
             
         except Exception as e:
+            self._close_stream()
             self.show_error(f"Recording error: {e}")
     
     def fm_demod(self):
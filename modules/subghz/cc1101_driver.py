@@ -5,6 +5,7 @@ CC1101 Driver - драйвер для Sub-GHz трансивера CC1101
 
 import time
 import logging
+from bisect import bisect_left
 from typing import Optional, List, Tuple
 
 try:
@@ -20,6 +21,16 @@ except ImportError:
     GPIO_AVAILABLE = False
 
 
+# Config and UI name pins by GPIO number ("GPIO25"), the 40-pin header is
+# Raspberry Pi compatible. Other drivers put OPi.GPIO in BOARD mode, so
+# translate to the physical header pin.
+BCM_TO_BOARD = {
+    0: 27, 1: 28, 2: 3, 3: 5, 4: 7, 5: 29, 6: 31, 7: 26, 8: 24, 9: 21,
+    10: 19, 11: 23, 12: 32, 13: 33, 14: 8, 15: 10, 16: 36, 17: 11, 18: 12,
+    19: 35, 20: 38, 21: 40, 22: 15, 23: 16, 24: 18, 25: 22, 26: 37, 27: 13,
+}
+
+
 # CC1101 Register addresses
 class CC1101Registers:
     """CC1101 configuration registers"""
@@ -91,6 +102,29 @@ class CC1101Registers:
     RXBYTES = 0xFB  # Overflow and number of bytes in RX FIFO
 
 
+# FIFO depth; a burst frame is header byte + up to one FIFO worth of data
+FIFO_SIZE = 64
+
+# PA table for different power levels: sorted dBm steps and their PATABLE values
+PA_LEVELS_DBM = (-30, -20, -15, -10, -6, 0, 5, 7, 10)
+PA_VALUES = (0x00, 0x0E, 0x1E, 0x27, 0x38, 0x8E, 0x84, 0xCC, 0xC0)
+
+
+def freq_registers(freq_mhz: float) -> Tuple[int, int, int]:
+    """
+    FREQ2/FREQ1/FREQ0 values for a carrier frequency.
+
+    Args:
+        freq_mhz: Frequency in MHz
+
+    Returns:
+        Tuple[int, int, int]: (FREQ2, FREQ1, FREQ0)
+    """
+    # Formula: FREQ = (freq_mhz * 2^16) / 26
+    freq_reg = int((freq_mhz * 1000000.0 / 26000000.0) * 65536)
+    return (freq_reg >> 16) & 0xFF, (freq_reg >> 8) & 0xFF, freq_reg & 0xFF
+
+
 class CC1101:
     """
     CC1101 Sub-GHz transceiver driver.
@@ -110,7 +144,7 @@ class CC1101:
             spi_bus: SPI bus number
             spi_device: SPI device number
             cs_pin: Chip select GPIO pin
-            gdo0_pin: GDO0 GPIO pin (for interrupts)
+            gdo0_pin: GDO0 GPIO number as in config, e.g. 25 for GPIO25 (for interrupts)
         """
         self.logger = logging.getLogger("cyberdeck.cc1101")
 
@@ -129,6 +163,15 @@ class CC1101:
         self.frequency = 433.92  # MHz
         self.modulation = "ASK_OOK"
 
+        # GDO0 configured as input - receive() waits on its edge instead of polling
+        self._gdo0_ready = False
+        self._gdo0_board_pin = BCM_TO_BOARD.get(gdo0_pin)
+
+        # Pre-allocated burst frames: header byte + data. The RX frame's
+        # data bytes stay zero (dummy bytes clocked out while reading)
+        self._rx_buf = bytearray(1 + FIFO_SIZE)
+        self._tx_buf = bytearray(1 + FIFO_SIZE)
+
     def initialize(self) -> bool:
         """
         Initialize CC1101 chip.
@@ -158,6 +201,8 @@ class CC1101:
             # Configure chip
             self.configure_default()
 
+            self._setup_gdo0()
+
             self.enabled = True
             return True
 
@@ -165,6 +210,29 @@ class CC1101:
             self.logger.error(f"Failed to initialize CC1101: {e}")
             return False
 
+    def _setup_gdo0(self):
+        """Configure GDO0 as input for packet-done edges (optional)"""
+        if not GPIO_AVAILABLE:
+            self.logger.info("OPi.GPIO not available - RX will poll RXBYTES")
+            return
+
+        if self._gdo0_board_pin is None:
+            self.logger.warning(f"GPIO{self.gdo0_pin} is not on the header - RX will poll RXBYTES")
+            return
+
+        try:
+            mode = GPIO.getmode()
+            if mode is None:
+                GPIO.setmode(GPIO.BOARD)
+            elif mode != GPIO.BOARD:
+                # Pin numbers are interpreted per mode, GPIO25 can't be addressed reliably
+                self.logger.warning("GPIO mode is not BOARD - RX will poll RXBYTES")
+                return
+            GPIO.setup(self._gdo0_board_pin, GPIO.IN)
+            self._gdo0_ready = True
+        except Exception as e:
+            self.logger.warning(f"GDO0 setup failed, RX will poll RXBYTES: {e}")
+
     def reset(self):
         """Reset CC1101 chip"""
         self.send_strobe(CC1101Registers.SRES)
@@ -231,8 +299,14 @@ class CC1101:
         if self.spi is None:
             return []
 
+        if length > FIFO_SIZE:
+            # Longer than any FIFO burst - one-off frame
+            cmd = bytearray(1 + length)
+        else:
+            cmd = memoryview(self._rx_buf)[:1 + length]
+
         # Bit 7 = 1 for read, bit 6 = 1 for burst
-        cmd = [reg | 0xC0] + [0x00] * length
+        cmd[0] = reg | 0xC0
         result = self.spi.xfer2(cmd)
         return result[1:]
 
@@ -247,40 +321,57 @@ class CC1101:
         if self.spi is None:
             return
 
+        n = len(data)
+        if n > FIFO_SIZE:
+            # Longer than any FIFO burst - one-off frame
+            cmd = bytearray(1 + n)
+        else:
+            cmd = memoryview(self._tx_buf)[:1 + n]
+
         # Bit 7 = 0 for write, bit 6 = 1 for burst
-        cmd = [reg | 0x40] + data
+        cmd[0] = reg | 0x40
+        cmd[1:] = bytes(data)
         self.spi.xfer2(cmd)
 
     def configure_default(self):
         """Configure CC1101 with default settings for 433.92 MHz ASK/OOK"""
 
+        if self.spi is None:
+            return
+
+        # Registers 0x00..0x15 go out as one burst; start from the chip's
+        # current (reset) values so the registers we don't touch keep them
+        config = bytearray(self.read_burst(CC1101Registers.IOCFG2, 0x16))
+
         # Basic configuration
-        self.write_register(CC1101Registers.IOCFG2, 0x0D)  # GDO2 - Serial Clock
-        self.write_register(CC1101Registers.IOCFG0, 0x06)  # GDO0 - Sync word sent/received
+        config[CC1101Registers.IOCFG2] = 0x0D  # GDO2 - Serial Clock
+        config[CC1101Registers.IOCFG0] = 0x06  # GDO0 - Sync word sent/received
 
-        self.write_register(CC1101Registers.PKTCTRL0, 0x32)  # Packet automation control
-        self.write_register(CC1101Registers.FSCTRL1, 0x06)  # Frequency synthesizer control
+        config[CC1101Registers.PKTCTRL0] = 0x32  # Packet automation control
+        config[CC1101Registers.FSCTRL1] = 0x06  # Frequency synthesizer control
 
         # Set frequency to 433.92 MHz
-        self.set_frequency(433.92)
+        (config[CC1101Registers.FREQ2],
+         config[CC1101Registers.FREQ1],
+         config[CC1101Registers.FREQ0]) = freq_registers(433.92)
 
         # Modem configuration for ASK/OOK
-        self.write_register(CC1101Registers.MDMCFG4, 0xC8)  # Modem configuration
-        self.write_register(CC1101Registers.MDMCFG3, 0x93)  # Modem configuration
-        self.write_register(CC1101Registers.MDMCFG2, 0x30)  # ASK/OOK, no preamble/sync
-        self.write_register(CC1101Registers.MDMCFG1, 0x22)  # Modem configuration
-        self.write_register(CC1101Registers.MDMCFG0, 0xF8)  # Modem configuration
+        config[CC1101Registers.MDMCFG4] = 0xC8  # Modem configuration
+        config[CC1101Registers.MDMCFG3] = 0x93  # Modem configuration
+        config[CC1101Registers.MDMCFG2] = 0x30  # ASK/OOK, no preamble/sync
+        config[CC1101Registers.MDMCFG1] = 0x22  # Modem configuration
+        config[CC1101Registers.MDMCFG0] = 0xF8  # Modem configuration
+
+        config[CC1101Registers.DEVIATN] = 0x15  # Modem deviation setting
 
-        self.write_register(CC1101Registers.DEVIATN, 0x15)  # Modem deviation setting
+        self.write_burst(CC1101Registers.IOCFG2, config)
+        self.frequency = 433.92
 
-        # AGC control
-        self.write_register(CC1101Registers.AGCCTRL2, 0x03)
-        self.write_register(CC1101Registers.AGCCTRL1, 0x00)
-        self.write_register(CC1101Registers.AGCCTRL0, 0x91)
+        # AGC control (AGCCTRL2, AGCCTRL1, AGCCTRL0)
+        self.write_burst(CC1101Registers.AGCCTRL2, [0x03, 0x00, 0x91])
 
-        # Front end configuration
-        self.write_register(CC1101Registers.FREND1, 0x56)
-        self.write_register(CC1101Registers.FREND0, 0x10)
+        # Front end configuration (FREND1, FREND0)
+        self.write_burst(CC1101Registers.FREND1, [0x56, 0x10])
 
         # Set TX power (max)
         self.write_register(CC1101Registers.PATABLE, 0xC0)
@@ -294,16 +385,8 @@ class CC1101:
         Args:
             freq_mhz: Frequency in MHz (300-928 MHz)
         """
-        # Formula: FREQ = (freq_mhz * 2^16) / 26
-        freq_reg = int((freq_mhz * 1000000.0 / 26000000.0) * 65536)
-
-        freq2 = (freq_reg >> 16) & 0xFF
-        freq1 = (freq_reg >> 8) & 0xFF
-        freq0 = freq_reg & 0xFF
-
-        self.write_register(CC1101Registers.FREQ2, freq2)
-        self.write_register(CC1101Registers.FREQ1, freq1)
-        self.write_register(CC1101Registers.FREQ0, freq0)
+        # FREQ2, FREQ1, FREQ0 are consecutive - one burst instead of three writes
+        self.write_burst(CC1101Registers.FREQ2, freq_registers(freq_mhz))
 
         self.frequency = freq_mhz
         self.logger.debug(f"Frequency set to {freq_mhz} MHz")
@@ -340,22 +423,14 @@ class CC1101:
         Args:
             power_dbm: Power in dBm (-30 to +10)
         """
-        # PA table for different power levels
-        pa_table = {
-            -30: 0x00,
-            -20: 0x0E,
-            -15: 0x1E,
-            -10: 0x27,
-            -6: 0x38,
-            0: 0x8E,
-            5: 0x84,
-            7: 0xCC,
-            10: 0xC0
-        }
-
-        # Find closest power level
-        closest = min(pa_table.keys(), key=lambda x: abs(x - power_dbm))
-        self.write_register(CC1101Registers.PATABLE, pa_table[closest])
+        # Find closest power level (ties go to the lower one)
+        idx = bisect_left(PA_LEVELS_DBM, power_dbm)
+        if idx == len(PA_LEVELS_DBM) or (
+                idx > 0 and PA_LEVELS_DBM[idx] - power_dbm >= power_dbm - PA_LEVELS_DBM[idx - 1]):
+            idx -= 1
+
+        closest = PA_LEVELS_DBM[idx]
+        self.write_register(CC1101Registers.PATABLE, PA_VALUES[idx])
         self.logger.info(f"TX power set to {closest} dBm")
 
     def enter_rx_mode(self):
@@ -382,12 +457,8 @@ class CC1101:
         """
         rssi_dec = self.read_register(CC1101Registers.RSSI)
 
-        if rssi_dec >= 128:
-            rssi_dbm = (rssi_dec - 256) // 2 - 74
-        else:
-            rssi_dbm = rssi_dec // 2 - 74
-
-        return rssi_dbm
+        # Two's complement sign-extend of the 8-bit register, then RSSI/2 - offset
+        return (((rssi_dec ^ 0x80) - 0x80) >> 1) - 74
 
     def read_lqi(self) -> int:
         """
@@ -443,27 +514,75 @@ class CC1101:
         # Enter RX mode
         self.enter_rx_mode()
 
-        start_time = time.time()
-        while (time.time() - start_time) < timeout:
-            # Check RX FIFO
-            rx_bytes = self.read_register(CC1101Registers.RXBYTES) & 0x7F
+        if self._gdo0_ready:
+            return self._receive_gdo0(timeout)
 
-            if rx_bytes > 0:
-                # Read data from RX FIFO
-                data = self.read_burst(0x3F, rx_bytes)  # 0x3F = RX FIFO
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            data = self._read_rx_fifo()
+            if data is not None:
+                return data
 
-                # Return to IDLE
-                self.enter_idle()
+            time.sleep(0.01)
 
-                self.logger.debug(f"Received {len(data)} bytes")
+        # Timeout - return to IDLE
+        self.enter_idle()
+        return None
+
+    def _receive_gdo0(self, timeout: float) -> Optional[List[int]]:
+        """
+        Receive by waiting on GDO0 (IOCFG0 = 0x06: deasserts at end of packet).
+
+        Args:
+            timeout: Timeout in seconds
+
+        Returns:
+            List[int]: Received bytes or None
+        """
+        deadline = time.monotonic() + timeout
+        timed_out = False
+
+        while True:
+            # The edge of a packet that ended before the wait was armed is
+            # lost, so check the FIFO before every wait and once after timeout
+            data = self._read_rx_fifo()
+            if data is not None:
                 return data
 
-            time.sleep(0.01)
+            remaining = deadline - time.monotonic()
+            if timed_out or remaining <= 0:
+                break
+
+            # Blocks in the kernel until the packet has been received
+            # (an edge without data, e.g. packet dropped on CRC, just loops)
+            channel = GPIO.wait_for_edge(self._gdo0_board_pin, GPIO.FALLING,
+                                         timeout=max(1, int(remaining * 1000)))
+            timed_out = channel is None
 
         # Timeout - return to IDLE
         self.enter_idle()
         return None
 
+    def _read_rx_fifo(self) -> Optional[List[int]]:
+        """
+        Read a received packet from the RX FIFO, if there is one.
+
+        Returns:
+            List[int]: Received bytes (radio back in IDLE) or None if the FIFO is empty
+        """
+        rx_bytes = self.read_register(CC1101Registers.RXBYTES) & 0x7F
+        if rx_bytes == 0:
+            return None
+
+        # Read data from RX FIFO
+        data = self.read_burst(0x3F, rx_bytes)  # 0x3F = RX FIFO
+
+        # Return to IDLE
+        self.enter_idle()
+
+        self.logger.debug(f"Received {len(data)} bytes")
+        return data
+
     def close(self):
         """Close SPI connection"""
         if self.spi:
@@ -471,3 +590,7 @@ class CC1101:
             self.spi.close()
             self.enabled = False
             self.logger.info("CC1101 closed")
+
+        if self._gdo0_ready:
+            GPIO.cleanup(self._gdo0_board_pin)
+            self._gdo0_ready = False
@@ -565,22 +565,27 @@ class SubGHzModuleFull(BaseModule):
 
     def _load_saved_signals(self):
         """Загрузить список сохранённых сигналов"""
-        if not os.path.exists(self.signals_dir):
+        try:
+            entries = os.scandir(self.signals_dir)
+        except FileNotFoundError:
             return
 
-        for filename in os.listdir(self.signals_dir):
-            if filename.endswith('.sub'):
-                filepath = os.path.join(self.signals_dir, filename)
+        # DirEntry carries the joined path and reuses its own stat result
+        with entries:
+            for entry in entries:
+                filename = entry.name
+                if not filename.endswith('.sub'):
+                    continue
 
                 # Try to extract info from filename
-                parts = filename.replace('.sub', '').split('_')
+                parts = filename[:-4].split('_')
 
                 signal_info = {
                     'name': filename,
-                    'filepath': filepath,
+                    'filepath': entry.path,
                     'frequency': 433.92,  # Default
                     'protocol': parts[0] if parts else None,
-                    'date': os.path.getmtime(filepath)
+                    'date': entry.stat().st_mtime
                 }
 
                 self.saved_signals.append(signal_info)